@@ -0,0 +1,60 @@
+import os
+import struct
+import time
+import tracemalloc
+
+def load_library():
+    # Benchmarks run headless by default
+    os.environ.setdefault("SDL_AUDIO_DRIVER", "dummy")
+    import sdl3_audio.audio as audio
+    audio._init_library(os.environ["SDL3_DLL_PATH"])
+    return audio
+
+def write_f32_wav(filename, seconds, n_channels=2, sample_rate=48000):
+    """Write a silent IEEE float WAV file of the given length"""
+    data_size = int(seconds*sample_rate)*n_channels*4
+    with open(filename, "wb") as f:
+        f.write(b"RIFF")
+        f.write(struct.pack("<I", 36+data_size))
+        f.write(b"WAVE")
+        f.write(b"fmt ")
+        f.write(struct.pack(
+            "<IHHIIHH",
+            16, # size of fmt chunk
+            3, # WAVE_FORMAT_IEEE_FLOAT
+            n_channels,
+            sample_rate,
+            sample_rate*n_channels*4, # byte rate
+            n_channels*4, # block align
+            32, # bits per sample
+        ))
+        f.write(b"data")
+        f.write(struct.pack("<I", data_size))
+        f.truncate(f.tell()+data_size)
+
+def best_time(func, repeat=5):
+    """Return the best wall time of 'repeat' runs of func(), in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter()-start)
+    return best
+
+def peak_python_memory(func):
+    """Return the peak of python-side allocations while running func(), in bytes"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def report(name, seconds=None, peak_bytes=None):
+    fields = [f"{name:<40}"]
+    if seconds is not None:
+        fields.append(f"{seconds*1000:10.2f} ms")
+    if peak_bytes is not None:
+        fields.append(f"{peak_bytes/2**20:10.2f} MiB peak")
+    print(" ".join(fields))
@@ -0,0 +1,61 @@
+"""Per-call overhead of SDL_PutAudioStreamData and SDL_GetAudioStreamAvailable
+
+Compares calling through the library attribute with hand-wrapped arguments
+and no argtypes, as before, against the prebound functions with argtypes.
+
+Usage: SDL3_DLL_PATH=/path/to/libSDL3.so python benchmarks/call_overhead.py [n_calls]
+"""
+import ctypes
+import os
+import sys
+
+import bench_utils
+
+def make_cases(audio, n_calls):
+    """Return (name, func) pairs, each func making 'n_calls' calls"""
+    spec = audio.AudioSpec("S16LE", 2, 48000)
+    stream = audio.AudioStream(None, spec, spec)
+    stream_p = stream._stream_p
+    frame = (ctypes.c_char*spec.frame_size)()
+
+    # a separate handle, configured like the old generated loader
+    plain = ctypes.CDLL(os.environ["SDL3_DLL_PATH"])
+    plain.SDL_PutAudioStreamData.restype = ctypes.c_bool
+    plain.SDL_GetAudioStreamAvailable.restype = ctypes.c_int
+
+    def put_before():
+        for _ in range(n_calls):
+            plain.SDL_PutAudioStreamData(stream_p, frame, ctypes.c_int(len(frame)))
+        stream.clear()
+
+    def put_after():
+        put = audio.SDL_PutAudioStreamData
+        for _ in range(n_calls):
+            put(stream_p, frame, len(frame))
+        stream.clear()
+
+    def available_before():
+        for _ in range(n_calls):
+            plain.SDL_GetAudioStreamAvailable(stream_p)
+
+    def available_after():
+        available = audio.SDL_GetAudioStreamAvailable
+        for _ in range(n_calls):
+            available(stream_p)
+
+    return (
+        ("SDL_PutAudioStreamData before", put_before),
+        ("SDL_PutAudioStreamData prebound", put_after),
+        ("SDL_GetAudioStreamAvailable before", available_before),
+        ("SDL_GetAudioStreamAvailable prebound", available_after),
+    )
+
+def main():
+    audio = bench_utils.load_library()
+    n_calls = int(sys.argv[1]) if len(sys.argv)>1 else 100000
+    for name, func in make_cases(audio, n_calls):
+        seconds = bench_utils.best_time(func)
+        print(f"{name:<40} {seconds/n_calls*1e9:10.1f} ns/call")
+
+if __name__ == "__main__":
+    main()
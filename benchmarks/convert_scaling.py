@@ -0,0 +1,35 @@
+"""Scaling of Audio.convert_many with the number of worker threads
+
+Usage: SDL3_DLL_PATH=/path/to/libSDL3.so python benchmarks/convert_scaling.py [n_clips]
+"""
+import os
+import sys
+
+import bench_utils
+
+audio = bench_utils.load_library()
+
+def main():
+    n_clips = int(sys.argv[1]) if len(sys.argv)>1 else 64
+    src_spec = audio.AudioSpec("S16LE", 2, 44100)
+    dst_spec = audio.AudioSpec("F32LE", 2, 48000)
+    # 2 seconds of noise per clip
+    clips = [
+        audio.Audio.from_buffer(os.urandom(2*44100*src_spec.frame_size), src_spec)
+        for _ in range(n_clips)
+    ]
+    print(f"{n_clips} clips of 2s, {src_spec.format} 44100Hz -> {dst_spec.format} 48000Hz, {os.cpu_count()} CPUs")
+
+    single = None
+    for max_workers in (1, 2, 4, 8):
+        seconds = bench_utils.best_time(
+            lambda: audio.Audio.convert_many(clips, dst_spec, max_workers=max_workers),
+            repeat=3
+        )
+        if single is None:
+            single = seconds
+        bench_utils.report(f"convert_many max_workers={max_workers}", seconds)
+        print(f"{'':<40} {single/seconds:10.2f} x speedup")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""CPU time spent waiting for a stream to drain, polling against wait_drained
+
+Usage: SDL3_DLL_PATH=/path/to/libSDL3.so python benchmarks/drain_cpu.py [seconds]
+"""
+import sys
+import time
+
+import bench_utils
+
+def play_and_wait(stream, au, wait):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    stream.put_audio(au)
+    wait()
+    return time.perf_counter()-wall, time.process_time()-cpu
+
+def poll(stream):
+    while stream.queued_data_length()>0:
+        pass
+
+def main():
+    audio = bench_utils.load_library()
+    seconds = float(sys.argv[1]) if len(sys.argv)>1 else 2.0
+    device = audio.open_default_playback_device()
+    stream = audio.AudioStream(device)
+    spec = stream.src_spec
+    au = audio.Audio.from_buffer(bytes(int(seconds*spec.sample_rate)*spec.frame_size), spec)
+    print(f"{seconds:.1f}s of audio on the '{audio.get_current_audio_driver()}' driver")
+
+    for name, wait in (
+        ("polling queued_data_length", lambda: poll(stream)),
+        ("wait_drained", stream.wait_drained),
+    ):
+        wall, cpu = play_and_wait(stream, au, wait)
+        print(f"{name:<40} {wall*1000:10.2f} ms wall {cpu*1000:10.2f} ms CPU")
+
+if __name__ == "__main__":
+    main()
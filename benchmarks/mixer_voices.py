@@ -0,0 +1,50 @@
+"""Cost of mixing voices in a Mixer at 48 kHz, per block and per voice
+
+Usage: SDL3_DLL_PATH=/path/to/libSDL3.so python benchmarks/mixer_voices.py [block_frames]
+"""
+import sys
+
+import numpy
+
+import bench_utils
+
+def open_device(audio):
+    device = audio.open_default_playback_device(audio.AudioSpec("F32LE", 2, 48000))
+    # mix by hand, without the device pulling at the same time
+    device.paused = True
+    return device
+
+def make_sound(audio):
+    noise = numpy.random.default_rng(0).uniform(-0.1, 0.1, (48000, 2))
+    return audio.Audio.from_numpy(noise.astype(numpy.float32), 48000)
+
+def make_case(audio, device, sound, n_voices, pitch, block_frames, n_blocks=100):
+    """Return a function mixing 'n_blocks' blocks of 'n_voices' looping voices"""
+    mixer = audio.Mixer(device, n_voices=n_voices)
+    for _ in range(n_voices):
+        mixer.play(sound, pitch=pitch, loop=True)
+    n_bytes = block_frames*mixer.spec.frame_size
+    def mix():
+        for _ in range(n_blocks):
+            mixer._mix(n_bytes)
+    return mix
+
+def main():
+    audio = bench_utils.load_library()
+    block_frames = int(sys.argv[1]) if len(sys.argv)>1 else 1024
+    device = open_device(audio)
+    block_seconds = block_frames/48000
+    sound = make_sound(audio)
+
+    for n_voices in (1, 8, 32, 64):
+        for pitch in (1.0, 1.25):
+            mix = make_case(audio, device, sound, n_voices, pitch, block_frames)
+            seconds = bench_utils.best_time(mix)/100
+            print(
+                f"{n_voices:3d} voices pitch {pitch:<5}"
+                f"{seconds*1e6:10.1f} us/block {seconds*1e6/n_voices:8.1f} us/voice"
+                f"{seconds/block_seconds*100:8.2f} % of real time"
+            )
+
+if __name__ == "__main__":
+    main()
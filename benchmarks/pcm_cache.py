@@ -0,0 +1,58 @@
+"""Startup cost of loading WAV files converted to the device spec, cold and warm PCMCache
+
+Usage: SDL3_DLL_PATH=/path/to/libSDL3.so python benchmarks/pcm_cache.py [n_files] [seconds]
+"""
+import os
+import sys
+import tempfile
+
+import bench_utils
+
+# a conversion with resampling, as loading 48kHz assets for a 44.1kHz device
+SPEC = ("S16LE", 2, 44100)
+
+def write_sources(directory, n_files, seconds):
+    filenames = []
+    for i in range(n_files):
+        filename = os.path.join(directory, f"sound{i}.wav")
+        bench_utils.write_f32_wav(filename, seconds)
+        filenames.append(filename)
+    return filenames
+
+def make_cases(audio, filenames, cache_dir):
+    """Return the functions loading every file: without cache, cold and warm cache"""
+    spec = audio.AudioSpec(*SPEC)
+
+    def load_and_convert():
+        for filename in filenames:
+            audio.Audio.from_wav_file(filename).convert(spec)
+
+    def cold():
+        cache = audio.PCMCache(cache_dir)
+        cache.clear()
+        for filename in filenames:
+            cache.load_wav(filename, spec)
+
+    def warm():
+        cache = audio.PCMCache(cache_dir)
+        for filename in filenames:
+            cache.load_wav(filename, spec)
+
+    return load_and_convert, cold, warm
+
+def main():
+    audio = bench_utils.load_library()
+    n_files = int(sys.argv[1]) if len(sys.argv)>1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv)>2 else 2.0
+    with tempfile.TemporaryDirectory() as tmp:
+        filenames = write_sources(tmp, n_files, seconds)
+        print(f"{n_files} files, F32LE stereo 48000Hz {seconds:.1f}s each, converted to {audio.AudioSpec(*SPEC)}")
+        load_and_convert, cold, warm = make_cases(audio, filenames, os.path.join(tmp, "cache"))
+
+        bench_utils.report("from_wav_file + convert", bench_utils.best_time(load_and_convert))
+        bench_utils.report("PCMCache cold (convert and write)", bench_utils.best_time(cold))
+        cold()
+        bench_utils.report("PCMCache warm (mmap)", bench_utils.best_time(warm))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Import and first-call latency: loading the library, a conversion and the first device
+
+Every measurement runs in a fresh interpreter, so nothing is cached by a previous run.
+
+Usage: SDL3_DLL_PATH=/path/to/libSDL3.so python benchmarks/startup.py [repeat]
+"""
+import os
+import subprocess
+import sys
+
+SCRIPT = """
+import os, time
+os.environ.setdefault("SDL_AUDIO_DRIVER", "dummy")
+start = time.perf_counter()
+import sdl3_audio.audio as audio
+imported = time.perf_counter()
+audio._init_library(os.environ["SDL3_DLL_PATH"])
+loaded = time.perf_counter()
+spec = audio.AudioSpec("S16LE", 2, 44100)
+au = audio.Audio.from_buffer(bytes(4*4800), audio.AudioSpec("F32LE", 2, 48000))
+au.convert(spec)
+converted = time.perf_counter()
+initialized = audio.sdl3.SDL_WasInit(audio.SDL_INIT_AUDIO)!=0
+device = audio.open_default_playback_device()
+opened = time.perf_counter()
+eager = time.perf_counter()
+for name in audio.typed_sdl3._restypes:
+    getattr(audio.sdl3, name)
+eager = time.perf_counter()-eager
+print(imported-start, loaded-imported, converted-loaded, opened-converted, eager, initialized)
+"""
+
+NAMES = (
+    "import sdl3_audio.audio",
+    "_init_library",
+    "first conversion",
+    "first device open (audio init)",
+    "binding the remaining symbols",
+)
+
+def measure(repeat):
+    """Return the best time of every step in NAMES over 'repeat' fresh interpreters"""
+    best = [float("inf")]*len(NAMES)
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            check=True, capture_output=True, text=True, env=os.environ
+        ).stdout.split()
+        if out[-1]!="False":
+            print("warning: the audio subsystem was initialized by a conversion")
+        best = [min(b, float(v)) for b, v in zip(best, out)]
+    return best
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv)>1 else 5
+    for name, seconds in zip(NAMES, measure(repeat)):
+        print(f"{name:<40} {seconds*1000:10.2f} ms")
+
+if __name__ == "__main__":
+    main()
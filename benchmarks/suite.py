@@ -0,0 +1,264 @@
+"""Benchmark suite of the audio hot paths, headless on the dummy or disk driver
+
+Every case reports the best time of several runs. Results can be written
+as JSON and compared against a saved baseline, the exit status is 1 when
+a case got slower than the baseline by more than the threshold.
+
+Usage:
+    SDL3_DLL_PATH=/path/to/libSDL3.so python benchmarks/suite.py [--driver dummy|disk]
+        [--output results.json] [--baseline baseline.json] [--threshold 0.1]
+        [--repeat 5] [--filter substring]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import bench_utils
+import call_overhead
+import drain_cpu
+import pcm_cache
+import startup
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark suite of sdl3_audio")
+    parser.add_argument("--driver", choices=("dummy", "disk"), default="dummy")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown counted as a regression, 0.1 by default")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run the cases containing this string")
+    return parser.parse_args()
+
+class Suite:
+    def __init__(self, repeat:int, name_filter:str):
+        self.repeat = repeat
+        self.name_filter = name_filter
+        self.results = {}
+
+    def selected(self, name):
+        return self.name_filter in name
+
+    def run(self, name, func, n_items=1, unit="call", repeat=None):
+        # 'n_items' is the number of units processed by one run of func()
+        if not self.selected(name):
+            return
+        self.record(name, bench_utils.best_time(func, repeat or self.repeat), n_items, unit)
+
+    def record(self, name, seconds, n_items=1, unit="call"):
+        # for cases measured by their own script, not by best_time()
+        if not self.selected(name):
+            return
+        self.results[name] = {"seconds":seconds, "items":n_items, "unit":unit}
+        rate = n_items/seconds if seconds>0 else float("inf")
+        print(f"{name:<44} {seconds*1000:10.3f} ms {rate:14.1f} {unit}/s")
+
+def bench_wav_load(suite, audio, tmp):
+    filename = os.path.join(tmp, "load.wav")
+    bench_utils.write_f32_wav(filename, 10)
+    size = os.path.getsize(filename)
+    suite.run("wav_load/from_wav_file 10s", lambda: audio.Audio.from_wav_file(filename), size/2**20, "MiB")
+    suite.run("wav_load/iter_wav_file 10s", lambda: list(audio.Audio.iter_wav_file(filename)), size/2**20, "MiB")
+
+def bench_convert(suite, audio):
+    pairs = (
+        (("S16LE", 2, 44100), ("F32LE", 2, 48000)),
+        (("F32LE", 2, 48000), ("S16LE", 2, 48000)),
+        (("S16LE", 2, 48000), ("S16LE", 2, 44100)),
+        (("U8", 1, 22050), ("F32LE", 2, 48000)),
+    )
+    for src, dst in pairs:
+        src_spec = audio.AudioSpec(*src)
+        dst_spec = audio.AudioSpec(*dst)
+        au = audio.Audio.from_buffer(os.urandom(src_spec.sample_rate*src_spec.frame_size), src_spec)
+        name = f"convert/{src[0]} {src[1]}ch {src[2]} -> {dst[0]} {dst[1]}ch {dst[2]}"
+        suite.run(name, lambda: au.convert(dst_spec), 1, "s of audio")
+
+def bench_join(suite, audio):
+    spec = audio.AudioSpec("F32LE", 2, 48000)
+    clips = [audio.Audio.from_buffer(bytes(24000*spec.frame_size), spec) for _ in range(100)]
+    suite.run("join/100 clips of 0.5s", lambda: audio.Audio.join(clips), 100, "clip")
+    suite.run("join/concat_view 100 clips", lambda: audio.Audio.concat_view(clips), 100, "clip")
+
+def bench_put_get(suite, audio):
+    spec = audio.AudioSpec("F32LE", 2, 48000)
+    stream = audio.AudioStream(None, spec, spec)
+    chunk = audio.Audio.from_buffer(bytes(4800*spec.frame_size), spec) # 100ms
+    out = bytearray(4800*spec.frame_size)
+    n_chunks = 100
+
+    def put_get():
+        for _ in range(n_chunks):
+            stream.put_audio(chunk)
+            stream.get_audio_nowait()
+
+    def put_get_into():
+        for _ in range(n_chunks):
+            stream.put_audio(chunk)
+            stream.get_audio_into(out)
+
+    mib = n_chunks*len(out)/2**20
+    suite.run("stream/put + get_audio_nowait 100ms chunks", put_get, mib, "MiB")
+    suite.run("stream/put + get_audio_into 100ms chunks", put_get_into, mib, "MiB")
+
+def bench_callback(suite, audio):
+    # An unbound stream calls its get callback from SDL_GetAudioStreamData
+    # whenever it runs short, so this goes through SDL and back into Python
+    spec = audio.AudioSpec("F32LE", 2, 48000)
+    stream = audio.AudioStream(None, spec, spec)
+    silence = bytes(256*spec.frame_size)
+    out = bytearray(len(silence))
+    n_calls = 2000
+    stream.set_source(lambda n_bytes: silence)
+
+    def pull():
+        for _ in range(n_calls):
+            stream.get_audio_into(out)
+
+    suite.run("callback/get callback with set_source", pull, n_calls, "callback")
+
+def bench_stream_lifetime(suite, audio):
+    spec = audio.AudioSpec("F32LE", 2, 48000)
+    device = audio.open_default_playback_device()
+    n_streams = 200
+
+    def create_destroy():
+        for _ in range(n_streams):
+            stream = audio.AudioStream(None, spec, spec)
+            del stream
+
+    def create_bound():
+        for _ in range(n_streams):
+            stream = audio.AudioStream(device)
+            del stream
+
+    pool = audio.AudioStreamPool()
+    def pooled():
+        for _ in range(n_streams):
+            pool.release(pool.acquire(device))
+
+    suite.run("lifetime/create + destroy unbound", create_destroy, n_streams, "stream")
+    suite.run("lifetime/create + destroy bound", create_bound, n_streams, "stream")
+    suite.run("lifetime/AudioStreamPool acquire + release", pooled, n_streams, "stream")
+
+def bench_pcm_cache(suite, audio, tmp):
+    n_files = 20
+    directory = os.path.join(tmp, "pcm_cache")
+    os.mkdir(directory)
+    filenames = pcm_cache.write_sources(directory, n_files, 1.0)
+    load_and_convert, cold, warm = pcm_cache.make_cases(audio, filenames, os.path.join(directory, "cache"))
+    suite.run("pcm_cache/from_wav_file + convert 20x1s", load_and_convert, n_files, "file")
+    suite.run("pcm_cache/PCMCache cold 20x1s", cold, n_files, "file")
+    cold()
+    suite.run("pcm_cache/PCMCache warm 20x1s", warm, n_files, "file")
+
+def bench_startup(suite):
+    # each run is a fresh interpreter, see startup.py
+    names = [f"startup/{name}" for name in startup.NAMES]
+    if not any(suite.selected(name) for name in names):
+        return
+    for name, seconds in zip(names, startup.measure(suite.repeat)):
+        suite.record(name, seconds)
+
+def bench_call_overhead(suite, audio):
+    n_calls = 100000
+    for name, func in call_overhead.make_cases(audio, n_calls):
+        suite.run(f"calls/{name}", func, n_calls, "call")
+
+def bench_mixer(suite, audio):
+    try:
+        import mixer_voices
+    except ImportError: # needs numpy
+        print("mixer cases skipped, numpy is not installed")
+        return
+    device = mixer_voices.open_device(audio)
+    sound = mixer_voices.make_sound(audio)
+    n_blocks = 100
+    for n_voices in (1, 8, 32):
+        for pitch in (1.0, 1.25):
+            name = f"mixer/{n_voices} voices pitch {pitch} 1024 frames"
+            if not suite.selected(name):
+                continue
+            mix = mixer_voices.make_case(audio, device, sound, n_voices, pitch, 1024, n_blocks)
+            suite.run(name, mix, n_voices*n_blocks, "voice block")
+
+def bench_drain(suite, audio):
+    # CPU time spent while waiting for 0.5s of audio to drain,
+    # the wall time is bound to real time by the driver
+    device = audio.open_default_playback_device()
+    stream = audio.AudioStream(device)
+    spec = stream.src_spec
+    au = audio.Audio.from_buffer(bytes(spec.sample_rate//2*spec.frame_size), spec)
+    for name, wait in (
+        ("drain/CPU polling queued_data_length 0.5s", lambda: drain_cpu.poll(stream)),
+        ("drain/CPU wait_drained 0.5s", stream.wait_drained),
+    ):
+        if not suite.selected(name):
+            continue
+        cpu = min(drain_cpu.play_and_wait(stream, au, wait)[1] for _ in range(suite.repeat))
+        suite.record(name, cpu, 0.5, "s of audio")
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\ncompared to the baseline, threshold {threshold:.0%}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["seconds"]
+        ratio = result["seconds"]/before if before>0 else 1.0
+        flag = ""
+        if ratio>1+threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        print(f"{name:<44} {ratio:8.2f} x {flag}")
+    return regressions
+
+def main():
+    args = parse_args()
+    os.environ["SDL_AUDIO_DRIVER"] = args.driver
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.driver=="disk":
+            # keep the output of the disk driver out of the working directory
+            os.environ.setdefault("SDL_AUDIO_DISK_OUTPUT_FILE", os.path.join(tmp, "sdlaudio.raw"))
+        audio = bench_utils.load_library()
+        suite = Suite(args.repeat, args.filter)
+        print(f"driver '{args.driver}', best of {args.repeat} runs")
+
+        bench_wav_load(suite, audio, tmp)
+        bench_convert(suite, audio)
+        bench_join(suite, audio)
+        bench_put_get(suite, audio)
+        bench_callback(suite, audio)
+        bench_stream_lifetime(suite, audio)
+        bench_pcm_cache(suite, audio, tmp)
+        bench_call_overhead(suite, audio)
+        bench_mixer(suite, audio)
+        bench_drain(suite, audio)
+        bench_startup(suite)
+
+    report = {
+        "meta":{
+            "driver":args.driver,
+            "repeat":args.repeat,
+            "python":platform.python_version(),
+            "platform":platform.platform(),
+            "time":time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results":suite.results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        if compare(suite.results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Load time and python-side peak memory of Audio.from_wav_file
+
+Usage: SDL3_DLL_PATH=/path/to/libSDL3.so python benchmarks/wav_load.py [seconds]
+"""
+import ctypes
+import os
+import sys
+import tempfile
+
+import bench_utils
+
+audio = bench_utils.load_library()
+
+def legacy_from_wav_file(filename):
+    # The loader as it was before the SDL buffer got adopted:
+    # one python copy per byte, then one more into a ctypes buffer
+    spec = audio.SDL_AudioSpec()
+    buffer = ctypes.POINTER(ctypes.c_uint8)()
+    length = ctypes.c_uint32()
+    success = audio.sdl3.SDL_LoadWAV(
+        filename.encode("utf8"),
+        audio.byref(spec),
+        audio.byref(buffer),
+        audio.byref(length)
+    )
+    if not success:
+        raise audio.SDLError()
+    copied_buf = bytes([buffer[i] for i in range(length.value)])
+    audio.sdl3.SDL_free(buffer)
+    return ctypes.create_string_buffer(copied_buf, length.value)
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv)>1 else 300.0
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "bench.wav")
+        bench_utils.write_f32_wav(filename, seconds)
+        size = os.path.getsize(filename)
+        print(f"F32LE stereo 48000Hz, {seconds:.0f}s, {size/2**20:.1f} MiB")
+
+        bench_utils.report(
+            "Audio.from_wav_file",
+            bench_utils.best_time(lambda: audio.Audio.from_wav_file(filename)),
+            bench_utils.peak_python_memory(lambda: audio.Audio.from_wav_file(filename))
+        )
+        bench_utils.report(
+            "legacy per-byte copy",
+            bench_utils.best_time(lambda: legacy_from_wav_file(filename), repeat=1),
+            bench_utils.peak_python_memory(lambda: legacy_from_wav_file(filename))
+        )
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
+import collections
+import concurrent.futures
 import ctypes
+import hashlib
+import json
+import mmap as _mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
 import typing
+import weakref
 
 from . import typed_sdl3
 from .typed_sdl3 import *
@@ -12,6 +24,17 @@ else:
     byref = ctypes.byref
 NULL = ctypes.POINTER(ctypes.c_int)()
 
+# Hot functions, bound as globals by typed_sdl3.prebind in _init_library
+SDL_GetPointerProperty: typing.Callable[..., typing.Any]
+SDL_WaitSemaphoreTimeout: typing.Callable[..., bool]
+SDL_SignalSemaphore: typing.Callable[..., None]
+SDL_GetSemaphoreValue: typing.Callable[..., int]
+SDL_GetAudioStreamProperties: typing.Callable[..., int]
+SDL_PutAudioStreamData: typing.Callable[..., bool]
+SDL_GetAudioStreamData: typing.Callable[..., int]
+SDL_GetAudioStreamAvailable: typing.Callable[..., int]
+SDL_GetAudioStreamQueued: typing.Callable[..., int]
+
 # Added in SDL 3.2
 SDL_IsAudioDevicePlayback = lambda x:(x)&(1<<0)
 SDL_IsAudioDevicePhysical = lambda x:(x)&(1<<1)
@@ -33,15 +56,65 @@ def _init_library(sdl_dll_path:str):
 
     global sdl3
     sdl3 = typed_sdl3.load_sdl3_dll(sdl_dll_path)
+    # the functions called on hot paths become globals of this module
+    typed_sdl3.prebind(sdl3, globals())
+    # The audio subsystem is initialized by the first device or
+    # driver call, loading and converting audio never needs it
+    
+    import atexit
+    atexit.register(sdl3.SDL_Quit) # quit SDL at exit
+
+_audio_initialized = False
 
+def _ensure_audio_init():
+    global _audio_initialized
+    if _audio_initialized:
+        return
     if not sdl3.SDL_WasInit(SDL_INIT_AUDIO):
         result = sdl3.SDL_Init(SDL_INIT_AUDIO)
         if result==False:
             raise SDLError()
-    
-    import atexit
-    atexit.register(sdl3.SDL_Quit) # quit SDL at exit
+    _audio_initialized = True
+
 
+# Bumped whenever SDL reports an audio device being added, removed or
+# changing its format. Cached device and stream state is tagged with it.
+# SDL only delivers these events while the application pumps its event
+# queue, so the cache of device formats is off unless the app opts in
+_device_state_generation = 0
+_device_state_cache_enabled = False
+
+def enable_device_state_cache(enabled:bool=True):
+    # Serve device formats (device.spec, the device side of streams) from
+    # a cache dropped on SDL device events. Only enable it when the
+    # application pumps SDL events (SDL_PollEvent/SDL_PumpEvents),
+    # otherwise a device changing format would go unnoticed.
+    # The event watch is only installed while enabled, it runs in Python
+    # for every SDL event
+    global _device_state_cache_enabled, _device_state_generation
+    enabled = bool(enabled)
+    if enabled==_device_state_cache_enabled:
+        return
+    if enabled:
+        if not sdl3.SDL_AddEventWatch(_audio_device_event_watch, NULL):
+            raise SDLError()
+        # events were missed while disabled, drop what was cached
+        _device_state_generation += 1
+    else:
+        sdl3.SDL_RemoveEventWatch(_audio_device_event_watch, NULL)
+    _device_state_cache_enabled = enabled
+_AUDIO_DEVICE_EVENTS = frozenset((
+    SDL_EVENT_AUDIO_DEVICE_ADDED.value,
+    SDL_EVENT_AUDIO_DEVICE_REMOVED.value,
+    SDL_EVENT_AUDIO_DEVICE_FORMAT_CHANGED.value,
+))
+
+@SDL_EventFilter
+def _audio_device_event_watch(userdata, event):
+    global _device_state_generation
+    if event.contents.type in _AUDIO_DEVICE_EVENTS:
+        _device_state_generation += 1
+    return True
 
 def list_audio_drivers():
     n = sdl3.SDL_GetNumAudioDrivers()
@@ -53,6 +126,7 @@ def list_audio_drivers():
     return out
 
 def get_current_audio_driver():
+    _ensure_audio_init()
     drv_name = sdl3.SDL_GetCurrentAudioDriver()
     if drv_name is None:
         return None
@@ -88,6 +162,33 @@ SDL_AUDIO_S32BE.value:"S32BE",
 SDL_AUDIO_F32LE.value:"F32LE",
 SDL_AUDIO_F32BE.value:"F32BE",
 }
+# memoryview type codes of the formats in the native byte order
+_fmt2typecode = {
+SDL_AUDIO_U8.value:"B",
+SDL_AUDIO_S8.value:"b",
+}
+if sys.byteorder=="little":
+    _fmt2typecode[SDL_AUDIO_S16LE.value] = "h"
+    _fmt2typecode[SDL_AUDIO_S32LE.value] = "i"
+    _fmt2typecode[SDL_AUDIO_F32LE.value] = "f"
+else:
+    _fmt2typecode[SDL_AUDIO_S16BE.value] = "h"
+    _fmt2typecode[SDL_AUDIO_S32BE.value] = "i"
+    _fmt2typecode[SDL_AUDIO_F32BE.value] = "f"
+
+def _numpy_dtype(fmt:int):
+    # numpy is imported lazily, it is an optional dependency
+    import numpy
+    name = _fmt2str[fmt]
+    kind = {"U":"u", "S":"i", "F":"f"}[name[0]]
+    byte_order = {"LE":"<", "BE":">"}.get(name[-2:], "|")
+    return numpy.dtype(f"{byte_order}{kind}{_fmt2width[fmt]}")
+
+def _fmt_from_numpy_dtype(dtype) -> int:
+    for fmt in _fmt2str:
+        if _numpy_dtype(fmt)==dtype:
+            return fmt
+    raise TypeError(f"dtype '{dtype}' has no matching audio format, expected one of {list(_str2fmt.keys())}")
 
 class AudioSpec:
     _spec:SDL_AudioSpec
@@ -144,7 +245,11 @@ class AudioSpec:
             value._spec.freq==self._spec.freq
         )
 
+    def __hash__(self):
+        return hash((self._spec.format, self._spec.channels, self._spec.freq))
+
 def _list_devices(is_playback:bool):
+    _ensure_audio_init()
     cnt = ctypes.c_int(0)
     if is_playback:
         dev_id_p = sdl3.SDL_GetAudioPlaybackDevices(byref(cnt))
@@ -166,6 +271,7 @@ def list_recording_devices() -> list["PhysicalAudioDevice"]:
     return _list_devices(is_playback=False)
 
 def open_default_playback_device(spec_hint:AudioSpec|None=None) -> "LogicalAudioDevice":
+    _ensure_audio_init()
     if spec_hint is None:
         spec_p = ctypes.POINTER(SDL_AudioSpec)() # NULL
     elif isinstance(spec_hint, AudioSpec):
@@ -180,6 +286,7 @@ def open_default_playback_device(spec_hint:AudioSpec|None=None) -> "LogicalAudio
     return dev
 
 def open_default_recording_device(spec_hint:AudioSpec|None=None) -> "LogicalAudioDevice":
+    _ensure_audio_init()
     if spec_hint is None:
         spec_p = ctypes.POINTER(SDL_AudioSpec)() # NULL
     elif isinstance(spec_hint, AudioSpec):
@@ -193,6 +300,10 @@ def open_default_recording_device(spec_hint:AudioSpec|None=None) -> "LogicalAudi
     dev._default = True
     return dev
 
+# device ids are never reused, so names are cached for good
+_device_names: dict[int, str] = {}
+_device_specs: dict[int, tuple[int, "AudioSpec"]] = {}
+
 def _new_audio_device(cls, device_id):
     instance = object.__new__(cls)
     instance._device_id = SDL_AudioDeviceID(device_id)
@@ -206,10 +317,14 @@ class _AudioDevice:
     
     @property
     def name(self) -> str:
+        dev_id = self._device_id.value
+        if dev_id in _device_names:
+            return _device_names[dev_id]
         name = sdl3.SDL_GetAudioDeviceName(self._device_id)
         if name is None:
             raise SDLError()
-        return name.decode("utf8")
+        _device_names[dev_id] = name.decode("utf8")
+        return _device_names[dev_id]
     
     @property
     def playback(self):
@@ -239,11 +354,19 @@ class _AudioDevice:
         return dev
     
     def _get_spec(self) -> AudioSpec:
+        dev_id = self._device_id.value
+        cached = _device_specs.get(dev_id)
+        if (cached is not None and _device_state_cache_enabled
+                and cached[0]==_device_state_generation):
+            return cached[1]
+        generation = _device_state_generation
         spec_struct = SDL_AudioSpec()
         success = sdl3.SDL_GetAudioDeviceFormat(self._device_id, byref(spec_struct), NULL)
         if not success:
             raise SDLError()
-        return AudioSpec._from_struct(spec_struct)
+        spec = AudioSpec._from_struct(spec_struct)
+        _device_specs[dev_id] = (generation, spec)
+        return spec
 
     def __eq__(self, v):
         if not isinstance(v, _AudioDevice):
@@ -277,6 +400,8 @@ class LogicalAudioDevice(_AudioDevice):
         if self._device_id.value==0:
             return
         sdl3.SDL_CloseAudioDevice(self._device_id)
+        _device_names.pop(self._device_id.value, None)
+        _device_specs.pop(self._device_id.value, None)
 
     def duplicate(self, spec_hint=None) -> "LogicalAudioDevice":
         return self._open(spec_hint=spec_hint)
@@ -317,18 +442,284 @@ class LogicalAudioDevice(_AudioDevice):
         if not success:
             raise SDLError()
 
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_wav_encoding2str = {
+(_WAVE_FORMAT_PCM, 8):"U8",
+(_WAVE_FORMAT_PCM, 16):"S16LE",
+(_WAVE_FORMAT_PCM, 32):"S32LE",
+(_WAVE_FORMAT_IEEE_FLOAT, 32):"F32LE",
+}
+
+def _parse_wav_fmt_chunk(chunk:bytes) -> AudioSpec:
+    if len(chunk)<16:
+        raise ValueError("broken 'fmt ' chunk")
+    tag, n_channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", chunk)
+    if tag==_WAVE_FORMAT_EXTENSIBLE and len(chunk)>=26:
+        # the sub format GUID starts with the actual format tag
+        tag, = struct.unpack_from("<H", chunk, 24)
+    if (tag, bits) not in _wav_encoding2str:
+        raise ValueError(f"unsupported WAV encoding (format tag {tag:#06x}, {bits} bits)")
+    return AudioSpec(_wav_encoding2str[(tag, bits)], n_channels, sample_rate)
+
+def _read_wav_header(f) -> tuple[AudioSpec, int]:
+    # Parse the RIFF header, leaves the file at the beginning of the samples.
+    # Returns the spec and the length of the 'data' chunk
+    riff = f.read(12)
+    if len(riff)<12 or riff[:4]!=b"RIFF" or riff[8:]!=b"WAVE":
+        raise ValueError("not a RIFF WAVE file")
+    spec = None
+    while True:
+        header = f.read(8)
+        if len(header)<8:
+            raise ValueError("'data' chunk not found")
+        chunk_id = header[:4]
+        chunk_size = int.from_bytes(header[4:], "little")
+        if chunk_id==b"data":
+            if spec is None:
+                raise ValueError("'fmt ' chunk not found before the 'data' chunk")
+            return spec, chunk_size
+        # chunks are padded to an even size
+        padded_size = chunk_size+chunk_size%2
+        if chunk_id==b"fmt ":
+            spec = _parse_wav_fmt_chunk(f.read(padded_size))
+        else:
+            f.seek(padded_size, os.SEEK_CUR)
+
+class _SDLAllocation:
+    """Owns a block of memory allocated by SDL, frees it on collection"""
+    def __init__(self, ptr):
+        self._ptr = ptr
+
+    def __del__(self):
+        sdl3.SDL_free(self._ptr)
+
+def _adopt_sdl_buffer(ptr, length:int) -> ctypes.Array[ctypes.c_char]:
+    # Wrap the SDL allocated memory as a ctypes array without copying.
+    # The allocation is attached to the array, so that anything
+    # referencing the array (views, memoryviews) keeps the memory alive
+    address = ctypes.cast(ptr, ctypes.c_void_p).value
+    if not address or length==0:
+        sdl3.SDL_free(ptr)
+        return (ctypes.c_char*0)()
+    buffer = (ctypes.c_char*length).from_address(address)
+    buffer._sdl_allocation = _SDLAllocation(ptr) # type: ignore
+    return buffer
+
+def _c_buffer_from_writable(obj) -> ctypes.Array[ctypes.c_char]:
+    # Share the memory of a writable buffer-protocol object
+    with memoryview(obj) as view:
+        nbytes = view.nbytes
+    return (ctypes.c_char*nbytes).from_buffer(obj)
+
+class _Py_buffer(ctypes.Structure):
+    _fields_ = [
+        ("buf", ctypes.c_void_p),
+        ("obj", ctypes.c_void_p),
+        ("len", ctypes.c_ssize_t),
+        ("itemsize", ctypes.c_ssize_t),
+        ("readonly", ctypes.c_int),
+        ("ndim", ctypes.c_int),
+        ("format", ctypes.c_char_p),
+        ("shape", ctypes.c_void_p),
+        ("strides", ctypes.c_void_p),
+        ("suboffsets", ctypes.c_void_p),
+        ("internal", ctypes.c_void_p),
+    ]
+
+_PyObject_GetBuffer = ctypes.pythonapi.PyObject_GetBuffer
+_PyObject_GetBuffer.argtypes = (ctypes.py_object, ctypes.POINTER(_Py_buffer), ctypes.c_int)
+_PyObject_GetBuffer.restype = ctypes.c_int
+_PyBuffer_Release = ctypes.pythonapi.PyBuffer_Release
+_PyBuffer_Release.argtypes = (ctypes.POINTER(_Py_buffer),)
+_PyBuffer_Release.restype = None
+
+class _BufferExport:
+    """Holds a buffer export of an object, releases it on collection"""
+    def __init__(self, obj):
+        self._view = _Py_buffer()
+        # PyBUF_SIMPLE, raises BufferError for non-contiguous exporters
+        _PyObject_GetBuffer(obj, ctypes.byref(self._view), 0)
+
+    def __del__(self):
+        _PyBuffer_Release(ctypes.byref(self._view))
+
+def _c_buffer(obj) -> ctypes.Array[ctypes.c_char]:
+    # Shares the memory of any buffer-protocol object when possible
+    with memoryview(obj) as view:
+        if not view.c_contiguous:
+            return (ctypes.c_char*view.nbytes).from_buffer_copy(view.tobytes())
+        if not view.readonly:
+            return (ctypes.c_char*view.nbytes).from_buffer(obj)
+        if view.nbytes==0:
+            return (ctypes.c_char*0)()
+    # ctypes.from_buffer refuses read-only memory, so wrap it by address.
+    # The export is attached to the array, it keeps the object alive
+    # and stops it from being resized or closed (e.g. a mmap)
+    export = _BufferExport(obj)
+    buffer = (ctypes.c_char*export._view.len).from_address(export._view.buf)
+    buffer._buffer_export = export # type: ignore
+    return buffer
+
+class _Storage:
+    """Shared by an Audio and its slices, tells whether writable memory left the library"""
+    __slots__ = ("exported",)
+
+    def __init__(self, exported:bool=False):
+        self.exported = exported
+
+def _fixed_size_buffer(obj) -> bool:
+    # A ctypes view can be kept of these between calls. bytearray, array,
+    # mmap and memoryview would refuse to resize or release while exported
+    if isinstance(obj, ctypes.Array):
+        return True
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+def _new_audio(buffer:ctypes.Array[ctypes.c_char], spec:AudioSpec) -> "Audio":
+    instance = Audio.__new__(Audio)
+    instance._spec = spec
+    instance._buffer = buffer
+    instance._storage = _Storage()
+    return instance
+
+# shared by every Audio.convert_async call, created on first use
+_conversion_executor:concurrent.futures.ThreadPoolExecutor|None = None
+_conversion_executor_lock = threading.Lock()
+
+def _get_conversion_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _conversion_executor
+    with _conversion_executor_lock:
+        if _conversion_executor is None:
+            _conversion_executor = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix="sdl3_audio_convert"
+            )
+        return _conversion_executor
+
+class ConversionCache:
+    """LRU cache of converted Audio objects, limited by the size in bytes
+
+    The converted Audio is shared by every caller, it is read-only.
+    """
+    def __init__(self, max_bytes:int=64*1024*1024):
+        if not isinstance(max_bytes, int):
+            raise TypeError(f"'max_bytes' should be an int, not a '{max_bytes.__class__.__name__}'")
+        self._max_bytes = max_bytes
+        self._entries:collections.OrderedDict[tuple, Audio] = collections.OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # conversions may run in several threads
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<ConversionCache(size={self._size}, max_bytes={self._max_bytes}, entries={len(self._entries)})>"
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            converted = self._entries.get(key)
+            if converted is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return converted
+
+    def _store(self, key, converted:"Audio"):
+        size = len(converted._buffer)
+        with self._lock:
+            if size>self._max_bytes or key in self._entries:
+                return
+            self._entries[key] = converted
+            self._size += size
+            while self._size>self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted._buffer)
+                self._evictions += 1
+
 class Audio: # tests needed
     _spec: AudioSpec
     _buffer: ctypes.Array[ctypes.c_char]
+    _storage: _Storage
+    _digest: bytes|None = None
+    # True when the samples belong to a read-only object (e.g. bytes),
+    # memoryviews and arrays handed out are then read-only as well
+    _readonly: bool = False
 
     @classmethod
     def from_buffer(cls, buf, spec:AudioSpec):
-        assert len(buf)%spec.frame_size==0
-        instance = cls.__new__(cls)
-        instance._spec = spec
-        instance._buffer = ctypes.create_string_buffer(buf, len(buf))
+        buffer = _c_buffer(buf)
+        if len(buffer)%spec.frame_size!=0:
+            raise ValueError(f"the size of 'buf' should be a multiple of the frame size {spec.frame_size}")
+        instance = _new_audio(buffer, spec)
+        instance._readonly = hasattr(buffer, "_buffer_export")
+        # the caller may still write to a writable buffer
+        instance._storage.exported = not instance._readonly
         return instance
     
+    @classmethod
+    def from_numpy(cls, array, sample_rate:int=48000):
+        import numpy
+        if array.ndim==1: # mono
+            array = array.reshape(-1, 1)
+        elif array.ndim!=2:
+            raise ValueError(f"'array' should be shaped (frames,) or (frames, channels), not {array.shape}")
+        if array.dtype==numpy.float64:
+            array = array.astype(numpy.float32)
+        fmt = _fmt_from_numpy_dtype(array.dtype)
+        spec = AudioSpec(_fmt2str[fmt], array.shape[1], sample_rate)
+        # no copy when the array is already C contiguous
+        return cls.from_buffer(numpy.ascontiguousarray(array), spec)
+
+    @classmethod
+    def from_raw_file(cls, filename, spec:AudioSpec, mmap:bool=True):
+        with open(filename, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size%spec.frame_size!=0:
+                raise ValueError(f"the size of the file should be a multiple of the frame size {spec.frame_size}")
+            if mmap and size>0:
+                # Private copy-on-write mapping: the pages are read from
+                # the page cache shared by every process mapping the file,
+                # and stay shared as long as nobody writes to them
+                buf = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_COPY)
+            else:
+                buf = bytearray(size)
+                f.readinto(buf)
+        au = cls.from_buffer(buf, spec)
+        # 'buf' never leaves this function
+        au._storage.exported = False
+        return au
+
     @classmethod
     def from_wav_file(cls, filename):
         spec = SDL_AudioSpec()
@@ -343,25 +734,57 @@ class Audio: # tests needed
         if not success:
             raise SDLError()
 
-        # There should be a more elegant way to copy
-        # But we are using python, so we don't care
-        copied_buf = bytes([buffer[i] for i in range(length.value)])
-        sdl3.SDL_free(buffer)
+        # Adopt the buffer allocated by SDL instead of copying it
+        return _new_audio(
+            _adopt_sdl_buffer(buffer, length.value),
+            AudioSpec._from_struct(spec)
+        )
 
-        instance = cls.__new__(cls)
-        instance._spec = AudioSpec._from_struct(spec)
-        instance._buffer = ctypes.create_string_buffer(copied_buf, length.value)
-        return instance
+    @classmethod
+    def iter_wav_file(cls, filename, chunk_frames:int=4096):
+        # Only plain PCM and float WAV files can be read in chunks,
+        # use from_wav_file for the other encodings
+        if chunk_frames<=0:
+            raise ValueError("'chunk_frames' should be a positive int")
+        with open(filename, "rb") as f:
+            spec, remaining = _read_wav_header(f)
+            frame_size = spec.frame_size
+            chunk_size = chunk_frames*frame_size
+            while remaining>=frame_size:
+                buf = bytearray(min(chunk_size, remaining-remaining%frame_size))
+                n_read = f.readinto(buf)
+                n_read -= n_read%frame_size
+                if n_read==0: # truncated file
+                    break
+                if n_read<len(buf):
+                    del buf[n_read:]
+                remaining -= n_read
+                yield cls.from_buffer(buf, spec)
 
     @classmethod
     def join(cls, lst:list["Audio"]):
-        spec = lst[0].spec
-        
-        new_buf = b''.join(au._buffer[:] for au in lst) # type: ignore
+        spec = _check_same_spec(lst)
+        total_size = sum(au._nbytes for au in lst)
 
-        instance = cls.__new__(cls)
+        # allocate once and copy every part into place
+        buffer = (ctypes.c_char*total_size)()
+        address = ctypes.addressof(buffer)
+        for au in lst:
+            for part in au._iter_buffers():
+                ctypes.memmove(address, part, len(part))
+                address += len(part)
+        return _new_audio(buffer, spec)
+
+    @classmethod
+    def concat_view(cls, lst:list["Audio"]):
+        # The parts are kept as they are and never concatenated,
+        # put_audio streams them one by one
+        spec = _check_same_spec(lst)
+        instance = _AudioConcatView.__new__(_AudioConcatView)
         instance._spec = spec
-        instance._buffer = ctypes.create_string_buffer(new_buf, len(new_buf))
+        instance._segments = list(lst)
+        instance._storage = _Storage()
+        instance._size = sum(au._nbytes for au in lst)
         return instance
     
     @property    
@@ -370,9 +793,117 @@ class Audio: # tests needed
 
     @property
     def duration(self):
-        return len(self._buffer)/self._spec.frame_size/self._spec.sample_rate
+        return self._nbytes/self._spec.frame_size/self._spec.sample_rate
+
+    @property
+    def n_frames(self):
+        return self._nbytes//self._spec.frame_size
+
+    @property
+    def _nbytes(self) -> int:
+        return len(self._buffer)
+
+    def _iter_buffers(self) -> typing.Iterator[ctypes.Array[ctypes.c_char]]:
+        # the contiguous pieces of memory holding the samples, in order
+        yield self._buffer
+
+    def __getitem__(self, key:slice) -> "Audio":
+        # Frames in the range share the memory of this Audio
+        if not isinstance(key, slice):
+            raise TypeError(f"Audio should be indexed by a slice of frames, not '{key.__class__.__name__}'")
+        start, stop, step = key.indices(self.n_frames)
+        if step!=1:
+            raise ValueError("the step of the slice should be 1")
+        stop = max(start, stop)
+        frame_size = self._spec.frame_size
+        return self._view(start*frame_size, stop*frame_size)
+
+    def slice(self, start_s:float, end_s:float|None=None) -> "Audio":
+        # Times are clamped to [0, duration], unlike frame indices
+        # negative seconds don't count from the end
+        sample_rate = self._spec.sample_rate
+        start = max(round(start_s*sample_rate), 0)
+        stop = None if end_s is None else max(round(end_s*sample_rate), 0)
+        return self[start:stop]
+
+    def _view(self, start:int, stop:int) -> "Audio":
+        # 'start' and 'stop' are byte offsets aligned to frames
+        buffer = (ctypes.c_char*(stop-start)).from_buffer(self._buffer, start)
+        view = _new_audio(buffer, self._spec)
+        view._readonly = self._readonly
+        view._storage = self._storage
+        return view
+
+    def as_memoryview(self) -> memoryview:
+        frame_size = self._spec.frame_size
+        n_frames = len(self._buffer)//frame_size
+        view = memoryview(self._buffer).cast("B")
+        if self._readonly:
+            view = view.toreadonly()
+        else:
+            self._storage.exported = True
+        if n_frames==0:
+            return view
+        code = _fmt2typecode.get(self._spec._spec.format)
+        if code is None:
+            # memoryview can't describe a byte order other than the native one
+            return view.cast("B", (n_frames, frame_size))
+        return view.cast(code, (n_frames, self._spec.n_channels))
+
+    def to_numpy(self):
+        array = self._numpy_view(self._readonly)
+        if not self._readonly:
+            self._storage.exported = True
+        return array
+
+    def _numpy_view(self, readonly:bool=True):
+        # read-only by default, for the library's own use
+        import numpy
+        array = numpy.frombuffer(self._buffer, dtype=_numpy_dtype(self._spec._spec.format))
+        if readonly:
+            array.flags.writeable = False
+        return array.reshape(-1, self._spec.n_channels)
+
+    # The buffer protocol for Python classes (PEP 688) needs Python 3.12,
+    # memoryview(audio) raises TypeError before that, use as_memoryview()
+    def __buffer__(self, flags):
+        return self.as_memoryview()
+
+    def _exported(self) -> bool:
+        return self._storage.exported
+
+    def _content_digest(self) -> bytes:
+        # Hashed once while only the library holds the memory. Once
+        # writable memory was handed out (from_buffer, as_memoryview,
+        # to_numpy) the samples may change at any time, so they are
+        # hashed on every lookup
+        exported = self._exported()
+        if self._digest is not None and not exported:
+            return self._digest
+        digest = hashlib.blake2b(digest_size=16)
+        for part in self._iter_buffers():
+            digest.update(part)
+        if not exported:
+            self._digest = digest.digest()
+        return digest.digest()
+
+    def convert(self, spec:AudioSpec, out=None, cache:ConversionCache|None=None):
+        if out is not None:
+            if cache is not None:
+                raise ValueError("'out' and 'cache' can't be used together")
+            return self._convert_into(spec, out)
+        if cache is not None:
+            key = (self._content_digest(), self._spec, spec)
+            converted = cache._lookup(key)
+            if converted is None:
+                converted = self._convert(spec)
+                # shared by every caller, so nobody may write to it
+                converted._readonly = True
+                cache._store(key, converted)
+            return converted
+        return self._convert(spec)
 
-    def convert(self, spec:AudioSpec):
+    def _convert(self, spec:AudioSpec) -> "Audio":
         src_spec = self._spec._spec
         dst_spec = spec._spec
         dst_buf = ctypes.POINTER(ctypes.c_uint8)()
@@ -387,28 +918,217 @@ class Audio: # tests needed
         )
         if not success:
             raise SDLError()
-        
-        copied_buf = bytes([dst_buf[i] for i in range(dst_len.value)])
-        sdl3.SDL_free(dst_buf)
 
-        converted = Audio.__new__(Audio)
-        converted._spec = spec
-        converted._buffer = ctypes.create_string_buffer(copied_buf, dst_len.value)
+        # The converted samples stay in the buffer allocated by SDL
+        return _new_audio(_adopt_sdl_buffer(dst_buf, dst_len.value), spec)
+
+    def convert_async(self, spec:AudioSpec, cache:ConversionCache|None=None,
+                      executor:concurrent.futures.Executor|None=None) -> concurrent.futures.Future["Audio"]:
+        # ctypes releases the GIL while SDL converts,
+        # so conversions in worker threads run in parallel
+        if executor is None:
+            executor = _get_conversion_executor()
+        return executor.submit(self.convert, spec, None, cache)
+
+    @classmethod
+    def convert_many(cls, audios:typing.Iterable["Audio"], spec:AudioSpec,
+                     max_workers:int|None=None, cache:ConversionCache|None=None) -> list["Audio"]:
+        def convert(au:Audio):
+            return au.convert(spec, cache=cache)
+        if max_workers is None:
+            return list(_get_conversion_executor().map(convert, audios))
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(convert, audios))
+
+    def _convert_into(self, spec:AudioSpec, out):
+        out_buffer = _c_buffer_from_writable(out)
+
+        # SDL_ConvertAudioSamples always allocates the output,
+        # so run the conversion through a converter instead,
+        # reading the result straight into the caller's buffer
+        converter = AudioConverter(self._spec, spec)
+        converter.feed(self)
+        converter.flush()
+        available = converter.available_data_length()
+        if available>len(out_buffer):
+            raise ValueError(f"'out' is too small, {available} bytes are needed, got {len(out_buffer)}")
+        real_size = converter.read_into(out_buffer)
 
-        return converted
+        au = _new_audio((ctypes.c_char*real_size).from_buffer(out_buffer), spec)
+        au._storage.exported = True # the memory of 'out'
+        return au
     
     # could be implemented
     # repeat()
     # stretch()
     # mic()
 
+class _AudioConcatView(Audio):
+    """Audio made of several segments, concatenated only when needed"""
+    _segments: list[Audio]
+    _size: int
+    _joined: ctypes.Array[ctypes.c_char]|None = None
+    # memoryviews and arrays show the joined copy, writes to it would
+    # never reach the segments that put_audio and convert read
+    _readonly = True
+
+    @property
+    def _buffer(self): # type: ignore
+        # Concatenated on the first access to the contiguous samples
+        if self._joined is None:
+            self._joined = Audio.join(self._segments)._buffer
+        return self._joined
+
+    @property
+    def _nbytes(self) -> int:
+        return self._size
+
+    def _iter_buffers(self):
+        for segment in self._segments:
+            yield from segment._iter_buffers()
+
+    def _exported(self) -> bool:
+        return any(segment._exported() for segment in self._segments)
+
+    def _view(self, start:int, stop:int) -> Audio:
+        # Slice the segments in the range, still without concatenating
+        segments = []
+        offset = 0
+        for segment in self._segments:
+            end = offset+segment._nbytes
+            if end>start and offset<stop:
+                segments.append(segment._view(
+                    max(start-offset, 0),
+                    min(stop, end)-offset
+                ))
+            offset = end
+        if not segments:
+            return _new_audio((ctypes.c_char*0)(), self._spec)
+        return Audio.concat_view(segments)
+
+    def _convert(self, spec:AudioSpec) -> Audio:
+        converter = AudioConverter(self._spec, spec)
+        converter.feed(self)
+        converter.flush()
+        return converter.read()
+
+def _check_same_spec(lst:list[Audio]) -> AudioSpec:
+    if len(lst)==0:
+        raise ValueError("at least one Audio is needed")
+    spec = lst[0].spec
+    for au in lst:
+        if au.spec!=spec:
+            raise ValueError(f"all the Audio should share the same spec, got {spec} and {au.spec}")
+    return spec
+
+def _put_bytes(stream_p, buffer:ctypes.Array[ctypes.c_char], length:int):
+    success = SDL_PutAudioStreamData(stream_p, buffer, length)
+    if not success:
+        raise SDLError()
+
+def _put_audio_data(stream_p, audio:Audio):
+    for part in audio._iter_buffers():
+        _put_bytes(stream_p, part, len(part))
+
+def _get_audio_data(stream_p, buffer:ctypes.Array[ctypes.c_char], length:int) -> int:
+    real_size = SDL_GetAudioStreamData(stream_p, buffer, length)
+    if real_size<0:
+        raise SDLError()
+    return real_size
+
+def _read_audio(stream_p, length:int, spec:AudioSpec) -> Audio:
+    buffer = (ctypes.c_char*length)()
+    real_size = _get_audio_data(stream_p, buffer, length)
+    if real_size<length:
+        buffer = (ctypes.c_char*real_size).from_buffer(buffer)
+    return _new_audio(buffer, spec)
+
+def _stream_available(stream_p) -> int:
+    asize = SDL_GetAudioStreamAvailable(stream_p)
+    if asize<0:
+        raise SDLError()
+    return asize
+
+class AudioConverter:
+    """Converts audio chunk by chunk with a stream not bound to any device"""
+    if typing.TYPE_CHECKING:
+        _stream_p: ctypes._Pointer[SDL_AudioStream]
+    else:
+        _stream_p = None
+
+    def __init__(self, src_spec:AudioSpec, dst_spec:AudioSpec):
+        if not isinstance(src_spec, AudioSpec):
+            raise TypeError(f"'src_spec' should be a AudioSpec, not '{src_spec.__class__.__name__}'")
+        if not isinstance(dst_spec, AudioSpec):
+            raise TypeError(f"'dst_spec' should be a AudioSpec, not '{dst_spec.__class__.__name__}'")
+        stream_p = sdl3.SDL_CreateAudioStream(
+            byref(src_spec._spec),
+            byref(dst_spec._spec)
+        )
+        if not stream_p: # NULL
+            raise SDLError()
+        self._stream_p = stream_p
+        self._src_spec = src_spec
+        self._dst_spec = dst_spec
+
+    def __del__(self):
+        if not self._stream_p:
+            return
+        sdl3.SDL_DestroyAudioStream(self._stream_p)
+
+    def __repr__(self):
+        return f"<AudioConverter(src_spec={self._src_spec}, dst_spec={self._dst_spec})>"
+
+    @property
+    def src_spec(self):
+        return self._src_spec
+
+    @property
+    def dst_spec(self):
+        return self._dst_spec
+
+    def feed(self, chunk):
+        if isinstance(chunk, Audio):
+            if chunk.spec!=self._src_spec:
+                raise ValueError(f"the spec of 'chunk' {chunk.spec} doesn't match 'src_spec' {self._src_spec}")
+            _put_audio_data(self._stream_p, chunk)
+        else:
+            _put_audio_data(self._stream_p, Audio.from_buffer(chunk, self._src_spec))
+
+    def available_data_length(self):
+        return _stream_available(self._stream_p)
+
+    def read(self, length:int|None=None) -> Audio:
+        available = _stream_available(self._stream_p)
+        if length is None or length>available:
+            length = available
+        length -= length%self._dst_spec.frame_size
+        return _read_audio(self._stream_p, length, self._dst_spec)
+
+    def read_into(self, buf) -> int:
+        buffer = _c_buffer_from_writable(buf)
+        length = len(buffer)-len(buffer)%self._dst_spec.frame_size
+        return _get_audio_data(self._stream_p, buffer, length)
+
+    def flush(self):
+        # Push out the samples held back by the resampler,
+        # call it once the input ends
+        success = sdl3.SDL_FlushAudioStream(self._stream_p)
+        if not success:
+            raise SDLError()
+
+    def clear(self):
+        success = sdl3.SDL_ClearAudioStream(self._stream_p)
+        if not success:
+            raise SDLError()
+
 _PG_AUDIO_STREAM_PYOBJ = "pg_audio_stream_pyobj".encode("utf8")
 
 def _get_stream_pyobj(stream) -> "AudioStream":
-    prop_id = sdl3.SDL_GetAudioStreamProperties(stream)
+    prop_id = SDL_GetAudioStreamProperties(stream)
     if prop_id==0:
         raise SDLError()
-    stream_obj_p = sdl3.SDL_GetPointerProperty(
+    stream_obj_p = SDL_GetPointerProperty(
         prop_id, # type: ignore
         _PG_AUDIO_STREAM_PYOBJ, # type: ignore
         NULL # type: ignore
@@ -417,29 +1137,225 @@ def _get_stream_pyobj(stream) -> "AudioStream":
         raise RuntimeError("SDL stream is not bind to a AudioStream object")
     return ctypes.cast(stream_obj_p, ctypes.py_object).value # type: ignore
 
+class _CaptureRing:
+    """Fixed-size ring buffer filled from a recording stream"""
+    def __init__(self, size:int):
+        self._buffer = (ctypes.c_char*size)()
+        self._address = ctypes.addressof(self._buffer)
+        self._size = size
+        # total bytes written and read, positions are taken modulo size
+        self._written = 0
+        self._read = 0
+        self.dropped_bytes = 0
+        self._lock = threading.Lock()
+
+    def available(self) -> int:
+        return self._written-self._read
+
+    def fill(self, stream_p):
+        # Called on the SDL audio thread, moves everything available
+        # in the stream into the ring, dropping the oldest data on overflow
+        with self._lock:
+            available = _stream_available(stream_p)
+            while available>0:
+                n = min(available, self._size)
+                position = self._written%self._size
+                first = min(n, self._size-position)
+                n_got = SDL_GetAudioStreamData(stream_p, self._address+position, first)
+                if n_got==first and n>first:
+                    wrapped = SDL_GetAudioStreamData(stream_p, self._address, n-first)
+                    if wrapped>0:
+                        n_got += wrapped
+                if n_got<=0:
+                    break
+                # only what SDL actually wrote overwrote unread data
+                overflow = self._written-self._read+n_got-self._size
+                if overflow>0:
+                    self._read += overflow
+                    self.dropped_bytes += overflow
+                self._written += n_got
+                available -= n_got
+
+    def read_into(self, address:int, length:int) -> int:
+        with self._lock:
+            n = min(self._written-self._read, length)
+            position = self._read%self._size
+            first = min(n, self._size-position)
+            ctypes.memmove(address, self._address+position, first)
+            if n>first:
+                ctypes.memmove(address+first, self._address, n-first)
+            self._read += n
+        return n
+
+class _StreamStats:
+    """Counters of an AudioStream, updated by the stream and its callbacks"""
+    def __init__(self):
+        self.bytes_put = 0
+        self.bytes_got = 0
+        self.queued_high_water = 0
+        # queued bytes seen by the get callbacks, bucket i counts
+        # the depths in [2**(i-1), 2**i), bucket 0 the empty queue
+        self.queue_histogram = [0]*33
+        self.underruns = 0
+        # more data is expected: something was queued and the stream
+        # wasn't flushed or cleared since
+        self._expecting = False
+        # the device ran short while more data was expected
+        self._starved = False
+        self.callbacks = 0
+        self.callback_seconds = 0.0
+        self.callback_max_seconds = 0.0
+
+    def record_queued(self, queued:int):
+        if queued>self.queued_high_water:
+            self.queued_high_water = queued
+        self.queue_histogram[min(max(queued, 0).bit_length(), 32)] += 1
+
+    def record_short(self):
+        # The device asked for more than the queue holds. That is only
+        # an underrun if more data follows, the natural end of a sound
+        # and the silence after it are not
+        if self._expecting:
+            self._starved = True
+
+    def record_refill(self):
+        # called when data is queued or a new source is set
+        if self._starved:
+            self.underruns += 1
+            self._starved = False
+        self._expecting = True
+
+    def record_end(self):
+        # flush() or clear(), nothing more is expected for now
+        self._expecting = False
+        self._starved = False
+
+    def record_callback(self, seconds:float):
+        self.callbacks += 1
+        self.callback_seconds += seconds
+        if seconds>self.callback_max_seconds:
+            self.callback_max_seconds = seconds
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            "bytes_put":self.bytes_put,
+            "bytes_got":self.bytes_got,
+            "queued_high_water":self.queued_high_water,
+            # lower bound of each bucket in bytes -> count
+            "queue_histogram":{
+                (0 if i==0 else 1<<(i-1)):count
+                for i, count in enumerate(self.queue_histogram) if count
+            },
+            "underruns":self.underruns,
+            "callbacks":self.callbacks,
+            "callback_seconds":self.callback_seconds,
+            "callback_max_seconds":self.callback_max_seconds,
+        }
+
+# streams with metrics enabled
+_stats_registry:"weakref.WeakSet[AudioStream]" = weakref.WeakSet()
+_stats_by_default = False
+
+def enable_stream_stats(enabled:bool=True):
+    # Turns metrics on or off for the streams created from now on
+    global _stats_by_default
+    _stats_by_default = bool(enabled)
+
+def all_stream_stats() -> list[tuple["AudioStream", dict[str, typing.Any]]]:
+    return [
+        (stream, stream._stats.snapshot())
+        for stream in list(_stats_registry) if stream._stats is not None
+    ]
+
+def _resolve_future(future):
+    if not future.done():
+        future.set_result(None)
+
+def _wake_async_waiters(waiters:list):
+    # Called on the SDL audio thread, hands the wake up to the event loops.
+    # A loop thread may remove its entry at any time, so only the atomic
+    # pop decides whether the list is empty
+    while True:
+        try:
+            loop, future = waiters.pop()
+        except IndexError:
+            break
+        try:
+            loop.call_soon_threadsafe(_resolve_future, future)
+        except RuntimeError: # the loop is closed
+            pass
+
 @SDL_AudioStreamCallback
 def _audio_stream_get_callback(userdata, stream, additional_amount, total_amount):
     stream_obj = _get_stream_pyobj(stream)
+    stats = stream_obj._stats
+    if stats is not None:
+        start = time.perf_counter()
+        stats.record_queued(SDL_GetAudioStreamQueued(stream))
+        if additional_amount>0 and stream_obj._source is None:
+            # nothing refills the queue
+            stats.record_short()
+    if stream_obj._source is not None and additional_amount>0:
+        stream_obj._pull_source(additional_amount)
+    if stream_obj._drain_waiters>0:
+        if SDL_GetSemaphoreValue(stream_obj._semaphore_drain)==0:
+            SDL_SignalSemaphore(stream_obj._semaphore_drain)
+    if stream_obj._async_drain_waiters:
+        _wake_async_waiters(stream_obj._async_drain_waiters)
+    if stats is not None:
+        stats.record_callback(time.perf_counter()-start)
 
 @SDL_AudioStreamCallback
 def _audio_stream_put_callback(userdata, stream, additional_amount, total_amount):
     stream_obj = _get_stream_pyobj(stream)
-    if sdl3.SDL_GetSemaphoreValue(stream_obj._semaphore_get_audio)==0:
-        sdl3.SDL_SignalSemaphore(stream_obj._semaphore_get_audio)
+    stats = stream_obj._stats
+    if stats is not None:
+        start = time.perf_counter()
+    if stream_obj._capture_ring is not None:
+        stream_obj._capture_ring.fill(stream)
+    if SDL_GetSemaphoreValue(stream_obj._semaphore_get_audio)==0:
+        SDL_SignalSemaphore(stream_obj._semaphore_get_audio)
+    if stream_obj._async_get_waiters:
+        _wake_async_waiters(stream_obj._async_get_waiters)
+    if stats is not None:
+        stats.record_callback(time.perf_counter()-start)
 
 class AudioStream: # tests needed
     if typing.TYPE_CHECKING:
         _stream_p: ctypes._Pointer[SDL_AudioStream]
         _semaphore_get_audio: ctypes._Pointer[SDL_Semaphore]
+        _semaphore_drain: ctypes._Pointer[SDL_Semaphore]
+    _drain_waiters: int = 0
+    _async_get_waiters: list
+    _async_drain_waiters: list
+    _capture_ring: _CaptureRing|None = None
+    # (device state generation, src_spec, dst_spec)
+    _spec_cache: tuple[int, AudioSpec, AudioSpec]|None = None
+    # direction of the bound device, None while unbound. SDL owns the
+    # dst side of a playback stream and the src side of a recording one
+    _bound_playback: bool|None = None
+    _gain_cache: float|None = None
+    _frequency_ratio_cache: float|None = None
+    # (device id, src_spec) of the AudioStreamPool the stream came from
+    _pool_key: tuple[int, AudioSpec]|None = None
+    _stats: _StreamStats|None = None
+    # the last fixed-size buffer given to get_audio_into, with its ctypes view
+    _into_obj: typing.Any = None
+    _into_buffer: ctypes.Array[ctypes.c_char]
+    _source: typing.Callable[[int], typing.Any]|None = None
+    _source_pending: bytearray
+    _source_error: BaseException|None = None
 
     def _register_callbacks(self):
-        prop_id = sdl3.SDL_GetAudioStreamProperties(self._stream_p)
+        prop_id = SDL_GetAudioStreamProperties(self._stream_p)
         if prop_id==0:
             raise SDLError()
+        # the address of the object, turned back into
+        # the object with ctypes.cast in _get_stream_pyobj
         success = sdl3.SDL_SetPointerProperty(
             prop_id, # type: ignore
             _PG_AUDIO_STREAM_PYOBJ, # type: ignore
-            ctypes.py_object(self) # type: ignore
+            id(self) # type: ignore
         )
         if not success:
             raise SDLError()
@@ -500,14 +1416,22 @@ class AudioStream: # tests needed
         self._semaphore_get_audio = sdl3.SDL_CreateSemaphore(0) # type:ignore
         if not self._semaphore_get_audio:
             raise SDLError()
+        self._semaphore_drain = sdl3.SDL_CreateSemaphore(0) # type:ignore
+        if not self._semaphore_drain:
+            raise SDLError()
+        self._async_get_waiters = []
+        self._async_drain_waiters = []
 
         if binding_device is not None:
             self.bind(binding_device)
         self._register_callbacks()
+        if _stats_by_default:
+            self.enable_stats()
     
     def __del__(self):
         sdl3.SDL_DestroyAudioStream(self._stream_p)
         sdl3.SDL_DestroySemaphore(self._semaphore_get_audio)
+        sdl3.SDL_DestroySemaphore(self._semaphore_drain)
 
     def bind(self, device:LogicalAudioDevice):
         success = sdl3.SDL_BindAudioStream(
@@ -516,21 +1440,44 @@ class AudioStream: # tests needed
         )
         if not success:
             raise SDLError()
+        # binding changes the format on the device side
+        self._spec_cache = None
+        self._bound_playback = device.playback
 
     def unbind(self):
         sdl3.SDL_UnbindAudioStream(self._stream_p)
+        self._spec_cache = None
+        self._bound_playback = None
 
-    @property
-    def src_spec(self):
-        spec_struct = SDL_AudioSpec()
+    def _get_specs(self, device_side:bool) -> tuple[int, AudioSpec, AudioSpec]:
+        # The side set by this library only changes through its setters,
+        # which drop the cache. The side owned by a bound device changes
+        # with the device format, it is only cached on opt-in
+        cache = self._spec_cache
+        if cache is not None and (not device_side or (
+                _device_state_cache_enabled and cache[0]==_device_state_generation)):
+            return cache
+        generation = _device_state_generation
+        src_struct = SDL_AudioSpec()
+        dst_struct = SDL_AudioSpec()
         success = sdl3.SDL_GetAudioStreamFormat(
-            self._stream_p, 
-            byref(spec_struct),
-            ctypes.POINTER(SDL_AudioSpec)(), # NULL
+            self._stream_p,
+            byref(src_struct),
+            byref(dst_struct),
         )
         if not success:
             raise SDLError()
-        return AudioSpec._from_struct(spec_struct)
+        cache = (
+            generation,
+            AudioSpec._from_struct(src_struct),
+            AudioSpec._from_struct(dst_struct)
+        )
+        self._spec_cache = cache
+        return cache
+
+    @property
+    def src_spec(self):
+        return self._get_specs(self._bound_playback is False)[1]
     
     @src_spec.setter
     def src_spec(self, new_spec:AudioSpec):
@@ -542,18 +1489,11 @@ class AudioStream: # tests needed
         )
         if not success:
             raise SDLError()
+        self._spec_cache = None
     
     @property
     def dst_spec(self):
-        spec_struct = SDL_AudioSpec()
-        success = sdl3.SDL_GetAudioStreamFormat(
-            self._stream_p,
-            ctypes.POINTER(SDL_AudioSpec)(), # NULL
-            byref(spec_struct),
-        )
-        if not success:
-            raise SDLError()
-        return AudioSpec._from_struct(spec_struct)
+        return self._get_specs(self._bound_playback is True)[2]
     
     @dst_spec.setter
     def dst_spec(self, new_spec:AudioSpec):
@@ -565,49 +1505,239 @@ class AudioStream: # tests needed
         )
         if not success:
             raise SDLError()
+        self._spec_cache = None
     
     def queued_data_length(self):
-        qsize = sdl3.SDL_GetAudioStreamQueued(self._stream_p)
+        self._raise_source_error()
+        qsize = SDL_GetAudioStreamQueued(self._stream_p)
         if qsize<0:
             raise SDLError()
         return qsize
     
     def available_data_length(self):
-        asize = sdl3.SDL_GetAudioStreamAvailable(self._stream_p)
-        if asize<0:
-            raise SDLError()
-        return asize
+        self._raise_source_error()
+        if self._capture_ring is not None:
+            return self._capture_ring.available()
+        return _stream_available(self._stream_p)
     
     def flush(self):
+        # Marks the end of the input, the queue running dry
+        # afterwards doesn't count as an underrun
         success = sdl3.SDL_FlushAudioStream(self._stream_p)
         if not success:
             raise SDLError()
+        if self._stats is not None:
+            self._stats.record_end()
     
     def clear(self):
         success = sdl3.SDL_ClearAudioStream(self._stream_p)
         if not success:
             raise SDLError()
+        if self._stats is not None:
+            self._stats.record_end()
     
+    def set_source(self, source):
+        # Pull mode: when the device asks for more data, the source
+        # is called with the number of bytes needed and returns an Audio
+        # or a buffer. An iterable yields chunks of any size instead.
+        # The source is dropped once it returns None or an empty chunk
+        self._raise_source_error()
+        if source is None:
+            self._source = None
+            return
+        if not callable(source):
+            iterator = iter(source)
+            source = lambda n_bytes: next(iterator, None)
+        self._source_pending = bytearray()
+        self._source = source
+        if self._stats is not None:
+            self._stats.record_refill()
+
+    def _pull_source(self, n_bytes:int):
+        # Called on the SDL audio thread, errors are kept
+        # to be raised on the thread using the stream
+        source = self._source
+        pending = self._source_pending
+        n_requested = n_bytes
+        try:
+            if pending:
+                n_put = min(len(pending), n_bytes)
+                _put_bytes(self._stream_p, (ctypes.c_char*len(pending)).from_buffer(pending), n_put)
+                del pending[:n_put]
+                n_bytes -= n_put
+            while n_bytes>0:
+                chunk = source(n_bytes)
+                if chunk is None:
+                    self._source = None
+                    if self._stats is not None:
+                        self._stats.record_end()
+                    return
+                parts = chunk._iter_buffers() if isinstance(chunk, Audio) else (_c_buffer(chunk),)
+                got_data = False
+                for part in parts:
+                    got_data = got_data or len(part)>0
+                    if n_bytes==0:
+                        pending += part
+                    elif len(part)>n_bytes:
+                        # put exactly what is asked for, keep the rest
+                        _put_bytes(self._stream_p, part, n_bytes)
+                        pending += memoryview(part)[n_bytes:]
+                        n_bytes = 0
+                    else:
+                        _put_bytes(self._stream_p, part, len(part))
+                        n_bytes -= len(part)
+                if not got_data:
+                    self._source = None
+                    if self._stats is not None:
+                        self._stats.record_end()
+                    return
+        except BaseException as e:
+            self._source = None
+            self._source_error = e
+        finally:
+            if self._stats is not None:
+                self._stats.bytes_put += n_requested-n_bytes
+                if n_bytes>0 and self._source_error is not None:
+                    # the source failed before delivering what was asked
+                    self._stats.underruns += 1
+
+    def _raise_source_error(self):
+        if self._source_error is not None:
+            error = self._source_error
+            self._source_error = None
+            raise error
+
     def put_audio(self, audio:Audio):
-        success = sdl3.SDL_PutAudioStreamData(
-            self._stream_p, 
-            audio._buffer, # type:ignore
-            ctypes.c_int(len(audio._buffer))
-        )
-        if not success:
-            raise SDLError()
+        self._raise_source_error()
+        _put_audio_data(self._stream_p, audio)
+        if self._stats is not None:
+            self._stats.bytes_put += audio._nbytes
+            self._stats.record_refill()
+            self._stats.record_queued(self.queued_data_length())
+
+    def enable_stats(self, enabled:bool=True):
+        # Metrics cost a check per call when disabled. Enabling them
+        # again starts from zero
+        if enabled:
+            self._stats = _StreamStats()
+            _stats_registry.add(self)
+        else:
+            self._stats = None
+            _stats_registry.discard(self)
+
+    def stats(self) -> dict[str, typing.Any]|None:
+        # A snapshot of the metrics, None when they are disabled
+        if self._stats is None:
+            return None
+        return self._stats.snapshot()
     
+    def play_file(self, filename, chunk_frames:int=4096, queued_chunks:int=4, timeout:float|None=None):
+        # Stream a WAV file into the stream chunk by chunk,
+        # keeping at most 'queued_chunks' chunks queued at a time.
+        # Returns when the file is drained, the previous 'src_spec'
+        # is then restored. 'timeout' bounds the whole playback, on
+        # timeout (or any error) the stream is cleared and stops playing
+        if queued_chunks<=0:
+            raise ValueError("'queued_chunks' should be a positive int")
+        if timeout is not None and timeout<0:
+            raise ValueError("'timeout' should be None, 0 or a positive number")
+        deadline = None if timeout is None else time.monotonic()+timeout
+        def remaining():
+            return None if deadline is None else max(deadline-time.monotonic(), 0)
+        previous_spec = self.src_spec
+        chunks = Audio.iter_wav_file(filename, chunk_frames)
+        limit = None
+        try:
+            for chunk in chunks:
+                if limit is None:
+                    if chunk.spec!=previous_spec:
+                        self.src_spec = chunk.spec
+                    limit = (queued_chunks-1)*chunk_frames*chunk.spec.frame_size
+                self.wait_below(limit, remaining())
+                self.put_audio(chunk)
+            self.flush()
+            self.wait_drained(remaining())
+        except BaseException:
+            self.clear()
+            raise
+        finally:
+            # closes the file right away, not when the generator is collected
+            chunks.close()
+            if self.src_spec!=previous_spec:
+                self.src_spec = previous_spec
+
+    def wait_below(self, n_bytes:int, timeout:float|None=None):
+        # Block until at most 'n_bytes' are queued. The get callback
+        # wakes the waiting thread up every time the device pulls data,
+        # so no CPU is used while waiting.
+        # A paused or unbound stream never drains by itself
+        if timeout is not None and timeout<0:
+            raise ValueError("'timeout' should be None, 0 or a positive number")
+        deadline = None if timeout is None else time.monotonic()+timeout
+        self._drain_waiters += 1
+        try:
+            while self.queued_data_length()>n_bytes:
+                # wait in slices, so Ctrl+C still works
+                wait_ms = 100
+                if deadline is not None:
+                    remaining = deadline-time.monotonic()
+                    if remaining<=0:
+                        raise TimeoutError("'wait_below' timeout")
+                    wait_ms = min(wait_ms, int(remaining*1000)+1)
+                SDL_WaitSemaphoreTimeout(self._semaphore_drain, wait_ms)
+        finally:
+            self._drain_waiters -= 1
+
+    def wait_drained(self, timeout:float|None=None):
+        self.wait_below(0, timeout)
+
+    async def _async_wait_until(self, waiters:list, predicate):
+        # The future is registered before checking, so a callback
+        # running in between can't be missed
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = (loop, loop.create_future())
+            waiters.append(entry)
+            try:
+                if predicate():
+                    return
+                await entry[1]
+            finally:
+                try:
+                    waiters.remove(entry)
+                except ValueError: # already taken by the callback
+                    pass
+
+    async def aget_audio(self) -> Audio:
+        await self._async_wait_until(
+            self._async_get_waiters,
+            lambda: self.available_data_length()>0
+        )
+        return self.get_audio_nowait()
+
+    async def aput_audio(self, audio:Audio, max_queued:int|None=None):
+        # Waits until at most 'max_queued' bytes are queued before putting,
+        # by default the size of 'audio' itself
+        if max_queued is None:
+            max_queued = audio._nbytes
+        await self.await_below(max_queued)
+        self.put_audio(audio)
+
+    async def await_below(self, n_bytes:int):
+        await self._async_wait_until(
+            self._async_drain_waiters,
+            lambda: self.queued_data_length()<=n_bytes
+        )
+
+    async def adrain(self):
+        await self.await_below(0)
+
     def get_audio(self, timeout=-1):
         if timeout==-1:
-            success = sdl3.SDL_WaitSemaphoreTimeout(
-                self._semaphore_get_audio, 
-                ctypes.c_int32(-1)
-            )
+            success = SDL_WaitSemaphoreTimeout(self._semaphore_get_audio, -1)
         elif timeout>=0:
-            success = sdl3.SDL_WaitSemaphoreTimeout(
-                self._semaphore_get_audio,
-                ctypes.c_int32(int(timeout*1000))
-            )
+            success = SDL_WaitSemaphoreTimeout(self._semaphore_get_audio, int(timeout*1000))
         else:
             raise ValueError("'timeout' should be -1, 0 or a positive number")
         if not success:
@@ -617,46 +1747,887 @@ class AudioStream: # tests needed
     def get_audio_nowait(self, length:int|None=None) -> Audio:
         if length is None:
             length = self.available_data_length()
-        buffer = ctypes.create_string_buffer(length)
-        real_size = sdl3.SDL_GetAudioStreamData(
-            self._stream_p,
-            buffer, # type:ignore
-            ctypes.c_int(length)
-        )
-        if real_size<0:
-            raise SDLError()
-        audio_instance = Audio.__new__(Audio)
-        audio_instance._buffer = ctypes.create_string_buffer(
-            buffer[:], # type:ignore
-            real_size
-        )
-        audio_instance._spec = self.dst_spec
-        return audio_instance
+        spec = self.dst_spec
+        if self._capture_ring is not None:
+            buffer = (ctypes.c_char*length)()
+            real_size = self._capture_ring.read_into(ctypes.addressof(buffer), length)
+            if real_size<length:
+                buffer = (ctypes.c_char*real_size).from_buffer(buffer)
+            au = _new_audio(buffer, spec)
+        else:
+            au = _read_audio(self._stream_p, length, spec)
+        if self._stats is not None:
+            self._stats.bytes_got += au._nbytes
+        return au
+
+    def get_audio_into(self, buf) -> int:
+        # Like readinto(), fills 'buf' with whole frames and returns
+        # the number of bytes written. The ctypes view of a fixed-size
+        # buffer is kept, so reading into it repeatedly doesn't allocate.
+        # Other buffers are only exported during the call, so that
+        # a bytearray can be resized afterwards
+        if buf is self._into_obj:
+            n_got = self._get_into(self._into_buffer)
+        elif _fixed_size_buffer(buf):
+            self._into_buffer = _c_buffer_from_writable(buf)
+            self._into_obj = buf
+            n_got = self._get_into(self._into_buffer)
+        else:
+            with memoryview(buf) as view:
+                buffer = (ctypes.c_char*view.nbytes).from_buffer(view)
+                try:
+                    n_got = self._get_into(buffer)
+                finally:
+                    del buffer
+        if self._stats is not None:
+            self._stats.bytes_got += n_got
+        return n_got
+
+    def _get_into(self, buffer:ctypes.Array[ctypes.c_char]) -> int:
+        length = len(buffer)
+        length -= length%self._dst_frame_size()
+        if self._capture_ring is not None:
+            return self._capture_ring.read_into(ctypes.addressof(buffer), length)
+        return _get_audio_data(self._stream_p, buffer, length)
+
+    def _dst_frame_size(self) -> int:
+        # Unless a playback device owns it, the dst side only changes
+        # through this library, so the cached spec is used as is
+        cache = self._spec_cache
+        if cache is None or self._bound_playback is True:
+            return self.dst_spec.frame_size
+        return cache[2].frame_size
+
+    def set_capture_ring(self, size:int|None):
+        # Keep up to 'size' bytes of recorded audio in a ring buffer,
+        # filled by the put callback as soon as the device delivers data.
+        # The oldest data is dropped when the ring is full
+        if size is None:
+            self._capture_ring = None
+            return
+        frame_size = self.dst_spec.frame_size
+        if size<=0 or size%frame_size!=0:
+            raise ValueError(f"'size' should be a positive multiple of the frame size {frame_size}")
+        self._capture_ring = _CaptureRing(size)
+
+    @property
+    def capture_dropped_bytes(self) -> int:
+        if self._capture_ring is None:
+            return 0
+        return self._capture_ring.dropped_bytes
 
     @property
     def gain(self):
+        if self._gain_cache is not None:
+            return self._gain_cache
         gain = sdl3.SDL_GetAudioStreamGain(self._stream_p)
         if gain<0:
             raise SDLError()
+        self._gain_cache = gain
         return gain
     
     @gain.setter
     def gain(self,gain:float):
+        self._gain_cache = None
         success = sdl3.SDL_SetAudioStreamGain(self._stream_p, ctypes.c_float(float(gain)))
         if not success:
             raise SDLError()
     
     @property
     def frequency_ratio(self):
+        if self._frequency_ratio_cache is not None:
+            return self._frequency_ratio_cache
         ratio = sdl3.SDL_GetAudioStreamFrequencyRatio(self._stream_p)
         if ratio<0:
             raise SDLError()
+        self._frequency_ratio_cache = ratio
         return ratio
     
     @frequency_ratio.setter
     def frequency_ratio(self, ratio:float):
+        # SDL clamps the ratio, so the cache is refilled on the next read
+        self._frequency_ratio_cache = None
         success = sdl3.SDL_SetAudioStreamFrequencyRatio(self._stream_p, ctypes.c_float(float(ratio)))
         if not success:
             raise SDLError()
 
 
+
+class AudioStreamGroup:
+    """Streams bound, fed and cleared together
+
+    The streams are locked in a fixed order while a batch runs,
+    so the device thread sees either all of the changes or none.
+    Using the group as a context manager holds the locks across
+    several calls.
+    """
+    def __init__(self, streams:typing.Iterable[AudioStream]):
+        streams = list(streams)
+        for stream in streams:
+            if not isinstance(stream, AudioStream):
+                raise TypeError(f"'streams' should only contain AudioStream, not '{stream.__class__.__name__}'")
+        if len({id(stream) for stream in streams})!=len(streams):
+            raise ValueError("'streams' should not contain the same stream twice")
+        self._streams = streams
+        self._stream_array = (ctypes.POINTER(SDL_AudioStream)*len(streams))(
+            *(stream._stream_p for stream in streams)
+        )
+        # a fixed locking order, so that two groups
+        # sharing streams never wait on each other
+        self._lock_order = sorted(
+            streams,
+            key=lambda stream: ctypes.cast(stream._stream_p, ctypes.c_void_p).value or 0
+        )
+        self._lock_depth = 0
+
+    def __repr__(self):
+        return f"<AudioStreamGroup(n_streams={len(self._streams)})>"
+
+    def __len__(self):
+        return len(self._streams)
+
+    def __iter__(self):
+        return iter(self._streams)
+
+    @property
+    def streams(self) -> list[AudioStream]:
+        return list(self._streams)
+
+    def __enter__(self):
+        locked = []
+        try:
+            for stream in self._lock_order:
+                if not sdl3.SDL_LockAudioStream(stream._stream_p):
+                    raise SDLError()
+                locked.append(stream)
+        except BaseException:
+            for stream in reversed(locked):
+                sdl3.SDL_UnlockAudioStream(stream._stream_p)
+            raise
+        self._lock_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._lock_depth -= 1
+        for stream in reversed(self._lock_order):
+            sdl3.SDL_UnlockAudioStream(stream._stream_p)
+
+    def _check_unlocked(self, name:str):
+        # SDL locks the device and then each stream when binding,
+        # holding the stream locks here could deadlock with the device thread
+        if self._lock_depth>0:
+            raise RuntimeError(f"'{name}' can't be called while the group is locked")
+
+    def bind(self, device:LogicalAudioDevice):
+        self._check_unlocked("bind")
+        success = sdl3.SDL_BindAudioStreams(
+            device._device_id,
+            self._stream_array, # type: ignore
+            ctypes.c_int(len(self._streams))
+        )
+        if not success:
+            raise SDLError()
+        playback = device.playback
+        for stream in self._streams:
+            stream._spec_cache = None
+            stream._bound_playback = playback
+
+    def unbind(self):
+        self._check_unlocked("unbind")
+        sdl3.SDL_UnbindAudioStreams(
+            self._stream_array, # type: ignore
+            ctypes.c_int(len(self._streams))
+        )
+        for stream in self._streams:
+            stream._spec_cache = None
+            stream._bound_playback = None
+
+    def put_audio(self, audios:typing.Sequence[Audio]):
+        # One Audio for each stream, in the order of the group
+        if len(audios)!=len(self._streams):
+            raise ValueError(f"'audios' should contain {len(self._streams)} Audio, got {len(audios)}")
+        for au in audios:
+            if not isinstance(au, Audio):
+                raise TypeError(f"'audios' should only contain Audio, not '{au.__class__.__name__}'")
+        for stream in self._streams:
+            stream._raise_source_error()
+        with self:
+            for stream, au in zip(self._streams, audios):
+                _put_audio_data(stream._stream_p, au)
+                if stream._stats is not None:
+                    stream._stats.bytes_put += au._nbytes
+                    stream._stats.record_refill()
+                    stream._stats.record_queued(SDL_GetAudioStreamQueued(stream._stream_p))
+
+    def start(self, device:LogicalAudioDevice, audios:typing.Sequence[Audio]):
+        # Queues the audio while the streams are unbound, then binds them
+        # in one call, so that every stream starts on the same sample
+        self.unbind()
+        self.put_audio(audios)
+        self.bind(device)
+
+    def clear(self):
+        with self:
+            for stream in self._streams:
+                if not sdl3.SDL_ClearAudioStream(stream._stream_p):
+                    raise SDLError()
+                if stream._stats is not None:
+                    stream._stats.record_end()
+
+    def set_gain(self, gain:float|typing.Sequence[float]):
+        # A single gain for every stream, or one for each of them
+        if isinstance(gain, (int, float)):
+            gains = [gain]*len(self._streams)
+        else:
+            gains = list(gain)
+            if len(gains)!=len(self._streams):
+                raise ValueError(f"'gain' should contain {len(self._streams)} values, got {len(gains)}")
+        with self:
+            for stream, value in zip(self._streams, gains):
+                stream._gain_cache = None
+                success = sdl3.SDL_SetAudioStreamGain(stream._stream_p, ctypes.c_float(float(value)))
+                if not success:
+                    raise SDLError()
+
+class AudioStreamPool:
+    """Reuses AudioStream objects, keyed by the device and the source spec"""
+    def __init__(self, max_streams:int=64, idle_timeout:float|None=30.0):
+        if not isinstance(max_streams, int):
+            raise TypeError(f"'max_streams' should be an int, not a '{max_streams.__class__.__name__}'")
+        if max_streams<0:
+            raise ValueError("'max_streams' should not be negative")
+        if idle_timeout is not None and idle_timeout<0:
+            raise ValueError("'idle_timeout' should be None or a positive number")
+        self._max_streams = max_streams
+        self._idle_timeout = idle_timeout
+        # released streams in the order they came back,
+        # with the time they were released and their key
+        self._idle:collections.OrderedDict[AudioStream, tuple[float, tuple[int, AudioSpec]]] = collections.OrderedDict()
+        self._by_key:dict[tuple[int, AudioSpec], list[AudioStream]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<AudioStreamPool(idle={len(self._idle)}, max_streams={self._max_streams})>"
+
+    def __len__(self):
+        return len(self._idle)
+
+    @property
+    def max_streams(self):
+        return self._max_streams
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    def acquire(self, device:LogicalAudioDevice, src_spec:AudioSpec|None=None) -> AudioStream:
+        if not isinstance(device, LogicalAudioDevice):
+            raise TypeError(f"'device' should be a LogicalAudioDevice, not '{device.__class__.__name__}'")
+        if src_spec is None:
+            src_spec = device.spec
+        key = (device._device_id.value, src_spec)
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            streams = self._by_key.get(key)
+            stream = None
+            if streams:
+                stream = streams.pop()
+                del self._idle[stream]
+                self._hits += 1
+            else:
+                self._misses += 1
+        if stream is None:
+            stream = AudioStream(device, src_spec=src_spec)
+        else:
+            stream.bind(device)
+        stream._pool_key = key
+        return stream
+
+    def release(self, stream:AudioStream):
+        # Stops the stream and keeps it for the next acquire() with the same key
+        if not isinstance(stream, AudioStream):
+            raise TypeError(f"'stream' should be an AudioStream, not '{stream.__class__.__name__}'")
+        key = stream._pool_key
+        if key is None:
+            raise ValueError("'stream' was not acquired from a pool")
+        # Dropped directly, set_source() would raise a pending error
+        # of the source and the stream would be lost to the pool
+        stream._source = None
+        stream._source_error = None
+        stream._pool_key = None
+        stream.unbind()
+        stream.clear()
+        if stream.gain!=1.0:
+            stream.gain = 1.0
+        if stream.frequency_ratio!=1.0:
+            stream.frequency_ratio = 1.0
+        stream.set_capture_ring(None)
+
+        now = time.monotonic()
+        with self._lock:
+            self._idle[stream] = (now, key)
+            self._by_key.setdefault(key, []).append(stream)
+            self._evict_idle(now)
+
+    def evict_idle(self):
+        with self._lock:
+            self._evict_idle(time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            while self._idle:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        stream, (_, key) = self._idle.popitem(last=False)
+        streams = self._by_key[key]
+        streams.remove(stream)
+        if not streams:
+            del self._by_key[key]
+        self._evictions += 1
+
+    def _evict_idle(self, now:float):
+        # Expired streams are dropped lazily, the oldest come first
+        while len(self._idle)>self._max_streams:
+            self._evict_oldest()
+        if self._idle_timeout is None:
+            return
+        while self._idle:
+            released, _ = next(iter(self._idle.values()))
+            if now-released<self._idle_timeout:
+                break
+            self._evict_oldest()
+
+class Voice:
+    """A slot of a Mixer playing one sound"""
+    def __init__(self):
+        raise TypeError("Voice objects are created by Mixer.play")
+
+    @classmethod
+    def _new(cls, mixer:"Mixer"):
+        voice = object.__new__(cls)
+        voice._mixer = mixer
+        voice._data = None
+        voice._position = 0.0
+        voice._serial = 0
+        voice.gain = 1.0
+        voice.loop = False
+        voice._pan = 0.0
+        voice._pitch = 1.0
+        return voice
+
+    def __repr__(self):
+        return f"<Voice(playing={self.playing}, gain={self.gain}, pan={self._pan}, pitch={self._pitch}, loop={self.loop})>"
+
+    @property
+    def playing(self) -> bool:
+        return self._data is not None
+
+    @property
+    def pan(self) -> float:
+        return self._pan
+
+    @pan.setter
+    def pan(self, value:float):
+        if not -1<=value<=1:
+            raise ValueError("'pan' should be between -1 and 1")
+        self._pan = float(value)
+
+    @property
+    def pitch(self) -> float:
+        return self._pitch
+
+    @pitch.setter
+    def pitch(self, value:float):
+        if not value>0:
+            raise ValueError("'pitch' should be a positive number")
+        self._pitch = float(value)
+
+    def stop(self):
+        self._data = None
+
+    def _mix_into(self, out, ramp):
+        # Adds the next len(out) frames of the voice into 'out',
+        # reading the sound at 'pitch' speed with linear interpolation
+        import numpy
+        data = self._data
+        length = len(data)
+        n = len(out)
+        position = self._position
+        pitch = self._pitch
+        left = self.gain*min(1.0, 1.0-self._pan)
+        right = self.gain*min(1.0, 1.0+self._pan)
+
+        if pitch==1.0 and position.is_integer():
+            # plain slices, no interpolation needed
+            start = int(position)
+            done = 0
+            while done<n:
+                n_copy = min(n-done, length-start)
+                out[done:done+n_copy] += data[start:start+n_copy]*(left, right)
+                done += n_copy
+                start += n_copy
+                if start==length:
+                    if not self.loop:
+                        break
+                    start = 0
+        else:
+            positions = position+pitch*ramp[:n]
+            if self.loop:
+                positions %= length
+                n_valid = n
+            else:
+                n_valid = min(n, max(0, int(numpy.ceil((length-position)/pitch))))
+                positions = positions[:n_valid]
+            index = positions.astype(numpy.intp)
+            frac = (positions-index).astype(numpy.float32)[:, None]
+            next_index = index+1
+            if self.loop:
+                next_index[next_index==length] = 0
+            else:
+                numpy.minimum(next_index, length-1, out=next_index)
+            samples = data[index]*(1-frac)
+            samples += data[next_index]*frac
+            out[:n_valid] += samples*(left, right)
+
+        position += pitch*n
+        if self.loop:
+            self._position = position%length
+        elif position>=length:
+            self._data = None
+        else:
+            self._position = position
+
+class Mixer:
+    """Mixes a pool of voices into a single stream bound to a playback device"""
+    def __init__(self, device:LogicalAudioDevice, n_voices:int=32, cache:ConversionCache|None=None):
+        import numpy
+        if not isinstance(device, LogicalAudioDevice):
+            raise TypeError(f"'device' should be a LogicalAudioDevice, not '{device.__class__.__name__}'")
+        if not isinstance(n_voices, int):
+            raise TypeError(f"'n_voices' should be an int, not a '{n_voices.__class__.__name__}'")
+        if n_voices<=0:
+            raise ValueError("'n_voices' should be a positive number")
+        if not device.playback:
+            raise ValueError("'device' should be a playback device")
+        # Voices are mixed as native float32 stereo
+        # at the sample rate of the device
+        fmt = _fmt2str[_fmt_from_numpy_dtype(numpy.dtype(numpy.float32))]
+        self._spec = AudioSpec(fmt, 2, device.spec.sample_rate)
+        self._cache = cache
+        self._voices = [Voice._new(self) for _ in range(n_voices)]
+        self._serial = 0
+        self._lock = threading.Lock()
+        self._out = numpy.zeros((0, 2), numpy.float32)
+        self._ramp = numpy.zeros(0)
+        self._stream = AudioStream(device, src_spec=self._spec)
+        self._stream.set_source(self._mix)
+
+    def __repr__(self):
+        return f"<Mixer(n_voices={len(self._voices)}, playing={self.n_playing})>"
+
+    @property
+    def spec(self) -> AudioSpec:
+        return self._spec
+
+    @property
+    def stream(self) -> AudioStream:
+        return self._stream
+
+    @property
+    def voices(self) -> list[Voice]:
+        return list(self._voices)
+
+    @property
+    def n_playing(self) -> int:
+        return sum(voice._data is not None for voice in self._voices)
+
+    def play(self, sound:Audio, gain:float=1.0, pan:float=0.0, pitch:float=1.0, loop:bool=False) -> Voice:
+        # Takes a free voice, or the one started the longest time ago
+        # when every voice is busy
+        if not isinstance(sound, Audio):
+            raise TypeError(f"'sound' should be an Audio, not '{sound.__class__.__name__}'")
+        if sound.spec!=self._spec:
+            sound = sound.convert(self._spec, cache=self._cache)
+        if not -1<=pan<=1:
+            raise ValueError("'pan' should be between -1 and 1")
+        if not pitch>0:
+            raise ValueError("'pitch' should be a positive number")
+        data = sound._numpy_view()
+        if len(data)==0:
+            raise ValueError("'sound' should not be empty")
+
+        with self._lock:
+            free = [voice for voice in self._voices if voice._data is None]
+            if free:
+                voice = free[0]
+            else:
+                voice = min(self._voices, key=lambda voice: voice._serial)
+            voice._data = None
+            voice.gain = gain
+            voice.pan = pan
+            voice.pitch = pitch
+            voice.loop = loop
+            voice._position = 0.0
+            self._serial += 1
+            voice._serial = self._serial
+            voice._data = data
+        self._stream._raise_source_error()
+        return voice
+
+    def stop_all(self):
+        for voice in self._voices:
+            voice._data = None
+
+    def _mix(self, n_bytes:int):
+        # Called on the SDL audio thread by the stream's source,
+        # always returns a chunk so the source stays attached
+        import numpy
+        n_frames = -(-n_bytes//self._spec.frame_size)
+        if len(self._out)<n_frames:
+            self._out = numpy.zeros((n_frames, 2), numpy.float32)
+            self._ramp = numpy.arange(n_frames, dtype=numpy.float64)
+        out = self._out[:n_frames]
+        out.fill(0)
+        with self._lock:
+            for voice in self._voices:
+                if voice._data is not None:
+                    voice._mix_into(out, self._ramp)
+        return out
+
+_PCM_CACHE_MAGIC = b"SDLPCM\x00\x02"
+# magic, format, channels, sample rate, source size, source stat
+# (mtime_ns, ctime_ns, inode), source blake2b-128, data size
+_PCM_CACHE_HEADER = struct.Struct("<8sHHIQqqQ16sQ")
+# the samples start at a fixed offset, aligned for any sample format
+_PCM_CACHE_DATA_OFFSET = 80
+# where the source stat sits in the header, refreshed in place
+_PCM_CACHE_STAT = struct.Struct("<qqQ")
+_PCM_CACHE_STAT_OFFSET = struct.calcsize("<8sHHIQ")
+
+def _pcm_cache_stat(stat:os.stat_result) -> tuple[int, int, int]:
+    # ctime can't be set back by the user, on POSIX it changes with any
+    # write or utime. On Windows it is the creation time instead
+    return (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino)
+
+def _file_digest(filename:str) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as f:
+        while chunk := f.read(1<<20):
+            digest.update(chunk)
+    return digest.digest()
+
+class PCMCache:
+    """Directory of decoded and converted samples, reused across processes
+
+    An entry is named after the path of the source file and the target
+    spec. Its header records the size, mtime, ctime, inode and content
+    hash of the source, the raw samples follow. When any of the stat
+    fields changed, the source is hashed and the entry is still used if
+    the content didn't change. With 'verify' the source is hashed on
+    every load, for file systems where ctime doesn't follow writes
+    (it is the creation time on Windows).
+    """
+    def __init__(self, directory:str, verify:bool=False):
+        if not isinstance(directory, str):
+            raise TypeError(f"'directory' should be a str, not a '{directory.__class__.__name__}'")
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._verify = bool(verify)
+        self._hits = 0
+        self._misses = 0
+
+    def __repr__(self):
+        return f"<PCMCache('{self._directory}')>"
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def _entry_path(self, filename:str, spec:AudioSpec) -> str:
+        key = hashlib.blake2b(digest_size=16)
+        key.update(os.path.abspath(filename).encode("utf8"))
+        key.update(struct.pack("<HHI", spec._spec.format, spec._spec.channels, spec._spec.freq))
+        return os.path.join(self._directory, key.hexdigest()+".pcm")
+
+    def load_wav(self, filename:str, spec:AudioSpec) -> Audio:
+        # Reads the WAV file converted to 'spec', from the cache when possible
+        stat = os.stat(filename)
+        entry = self._entry_path(filename, spec)
+        au = self._read_entry(entry, filename, stat, spec)
+        if au is not None:
+            self._hits += 1
+            return au
+        self._misses += 1
+        au = Audio.from_wav_file(filename)
+        if au.spec!=spec:
+            au = au.convert(spec)
+        self._write_entry(entry, filename, stat, au)
+        return au
+
+    def _read_entry(self, entry:str, filename:str, stat:os.stat_result, spec:AudioSpec) -> Audio|None:
+        try:
+            f = open(entry, "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            header = f.read(_PCM_CACHE_HEADER.size)
+            if len(header)<_PCM_CACHE_HEADER.size:
+                return None
+            (magic, fmt, channels, freq, src_size, src_mtime_ns,
+             src_ctime_ns, src_ino, src_digest, data_size) = _PCM_CACHE_HEADER.unpack(header)
+            if magic!=_PCM_CACHE_MAGIC:
+                return None
+            if (fmt, channels, freq)!=(spec._spec.format, spec._spec.channels, spec._spec.freq):
+                return None
+            if src_size!=stat.st_size:
+                return None
+            if os.fstat(f.fileno()).st_size!=_PCM_CACHE_DATA_OFFSET+data_size:
+                return None # truncated
+            src_stat = _pcm_cache_stat(stat)
+            if self._verify or (src_mtime_ns, src_ctime_ns, src_ino)!=src_stat:
+                if src_digest!=_file_digest(filename):
+                    return None
+                if not self._verify:
+                    # Same content with a new stat (touched, copied, checked
+                    # out again), store it so the next hit skips the hash
+                    self._refresh_stat(entry, src_stat)
+            if data_size==0:
+                return _new_audio((ctypes.c_char*0)(), spec)
+            # Copy-on-write mapping of the whole entry, the samples
+            # are a view starting after the header
+            buf = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_COPY)
+        buffer = (ctypes.c_char*data_size).from_buffer(buf, _PCM_CACHE_DATA_OFFSET)
+        return _new_audio(buffer, spec)
+
+    def _refresh_stat(self, entry:str, src_stat:tuple[int, int, int]):
+        try:
+            with open(entry, "r+b") as f:
+                f.seek(_PCM_CACHE_STAT_OFFSET)
+                f.write(_PCM_CACHE_STAT.pack(*src_stat))
+        except OSError:
+            pass # a read-only cache still works, just hashes every time
+
+    def _write_entry(self, entry:str, filename:str, stat:os.stat_result, au:Audio):
+        header = _PCM_CACHE_HEADER.pack(
+            _PCM_CACHE_MAGIC,
+            au.spec._spec.format,
+            au.spec._spec.channels,
+            au.spec._spec.freq,
+            stat.st_size,
+            *_pcm_cache_stat(stat),
+            _file_digest(filename),
+            au._nbytes
+        )
+        # Written next to the entry and renamed into place,
+        # readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header.ljust(_PCM_CACHE_DATA_OFFSET, b"\x00"))
+                for part in au._iter_buffers():
+                    f.write(part)
+            os.replace(tmp_path, entry)
+        except PermissionError:
+            # Windows can't replace a file a live Audio still maps,
+            # the entry is written again by a later load
+            os.unlink(tmp_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self):
+        # Entries still mapped by a live Audio can't be removed on
+        # Windows, they are left in place
+        for name in os.listdir(self._directory):
+            if name.endswith(".pcm"):
+                try:
+                    os.unlink(os.path.join(self._directory, name))
+                except PermissionError:
+                    pass
+
+class SoundBank:
+    """Named sounds converted to one spec, loaded on first use or preloaded together"""
+    def __init__(self, files:dict[str, str], spec:AudioSpec, max_bytes:int|None=None,
+                 disk_cache:PCMCache|None=None):
+        if not isinstance(spec, AudioSpec):
+            raise TypeError(f"'spec' should be a AudioSpec, not '{spec.__class__.__name__}'")
+        if max_bytes is not None and not isinstance(max_bytes, int):
+            raise TypeError(f"'max_bytes' should be an int or None, not a '{max_bytes.__class__.__name__}'")
+        self._files = dict(files)
+        self._spec = spec
+        self._max_bytes = max_bytes
+        self._disk_cache = disk_cache
+        # preloaded sounds, slices of a single arena, never unloaded
+        self._arena:Audio|None = None
+        self._preloaded:dict[str, Audio] = {}
+        # sounds loaded on first use, least recently used first
+        self._loaded:collections.OrderedDict[str, Audio] = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, path:str, spec:AudioSpec, max_bytes:int|None=None,
+                       extension:str=".wav", disk_cache:PCMCache|None=None):
+        # Sounds are named after their path relative to the directory,
+        # without the extension and with '/' as separator
+        files = {}
+        for root, _, filenames in os.walk(path):
+            for filename in filenames:
+                if not filename.lower().endswith(extension):
+                    continue
+                full_path = os.path.join(root, filename)
+                name = os.path.relpath(full_path, path)[:-len(extension)]
+                files[name.replace(os.sep, "/")] = full_path
+        return cls(files, spec, max_bytes, disk_cache)
+
+    @classmethod
+    def from_manifest(cls, filename:str, spec:AudioSpec, max_bytes:int|None=None,
+                      disk_cache:PCMCache|None=None):
+        # The manifest is a JSON object mapping the names of the sounds
+        # to files, relative paths are relative to the manifest itself
+        with open(filename, encoding="utf8") as f:
+            manifest = json.load(f)
+        if not isinstance(manifest, dict):
+            raise ValueError("the manifest should be a JSON object mapping names to files")
+        base = os.path.dirname(os.path.abspath(filename))
+        files = {name:os.path.join(base, path) for name, path in manifest.items()}
+        return cls(files, spec, max_bytes, disk_cache)
+
+    def __repr__(self):
+        return f"<SoundBank(n_sounds={len(self._files)}, preloaded={len(self._preloaded)}, loaded={len(self._loaded)})>"
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, name:str):
+        return name in self._files
+
+    def __iter__(self):
+        return iter(self._files)
+
+    @property
+    def spec(self) -> AudioSpec:
+        return self._spec
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def size(self):
+        # bytes held by the sounds loaded on first use
+        return self._size
+
+    @property
+    def arena_size(self):
+        return 0 if self._arena is None else self._arena._nbytes
+
+    def _load(self, filename:str) -> Audio:
+        if self._disk_cache is not None:
+            return self._disk_cache.load_wav(filename, self._spec)
+        au = Audio.from_wav_file(filename)
+        if au.spec!=self._spec:
+            au = au.convert(self._spec)
+        return au
+
+    def __getitem__(self, name:str) -> Audio:
+        sound = self._preloaded.get(name)
+        if sound is not None:
+            return sound
+        with self._lock:
+            sound = self._loaded.get(name)
+            if sound is not None:
+                self._loaded.move_to_end(name)
+                return sound
+        if name not in self._files:
+            raise KeyError(name)
+        sound = self._load(self._files[name])
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = sound
+                self._size += sound._nbytes
+                self._evict()
+        return sound
+
+    def _evict(self):
+        # The sound just loaded stays even if it alone is over the budget
+        if self._max_bytes is None:
+            return
+        while self._size>self._max_bytes and len(self._loaded)>1:
+            _, sound = self._loaded.popitem(last=False)
+            self._size -= sound._nbytes
+
+    def preload(self, names:typing.Iterable[str]|None=None, max_workers:int|None=None):
+        # Loads the sounds, converts them in parallel and packs them
+        # into one arena, every sound becomes a slice of it.
+        # Preloading again replaces the previous arena
+        names = list(self._files) if names is None else list(names)
+        for name in names:
+            if name not in self._files:
+                raise KeyError(name)
+        if not names:
+            return
+        audios = []
+        for name in names:
+            with self._lock:
+                au = self._loaded.get(name)
+            if au is None:
+                if self._disk_cache is not None:
+                    au = self._disk_cache.load_wav(self._files[name], self._spec)
+                else:
+                    au = Audio.from_wav_file(self._files[name])
+            audios.append(au)
+        to_convert = [i for i, au in enumerate(audios) if au.spec!=self._spec]
+        converted = Audio.convert_many(
+            [audios[i] for i in to_convert], self._spec, max_workers
+        )
+        for i, au in zip(to_convert, converted):
+            audios[i] = au
+
+        arena = Audio.join(audios)
+        preloaded = {}
+        frame_size = self._spec.frame_size
+        start = 0
+        for name, au in zip(names, audios):
+            stop = start+au._nbytes//frame_size
+            preloaded[name] = arena[start:stop]
+            start = stop
+        with self._lock:
+            self._arena = arena
+            self._preloaded = preloaded
+            for name in names:
+                sound = self._loaded.pop(name, None)
+                if sound is not None:
+                    self._size -= sound._nbytes
+
+    def unload(self, name:str|None=None):
+        # Drops a sound loaded on first use, or all of them.
+        # Sounds still referenced elsewhere stay valid
+        with self._lock:
+            if name is None:
+                self._loaded.clear()
+                self._size = 0
+                return
+            sound = self._loaded.pop(name, None)
+            if sound is not None:
+                self._size -= sound._nbytes
@@ -1,3 +1,6 @@
+import concurrent.futures
+import typing
+
 def _init_library(lib_path:str)->None:...
 
 def dB(db:float)->float:...
@@ -15,6 +18,7 @@ class AudioSpec:
     @property
     def frame_size(self)->int:...
     def __init__(self, format:str, n_channels:int=2, sample_rate:int=48000)->None:...
+    def __hash__(self)->int:...
 
 def list_playback_devices() -> list["PhysicalAudioDevice"]:...
 def list_recording_devices() -> list["PhysicalAudioDevice"]:...
@@ -46,18 +50,71 @@ class LogicalAudioDevice(_AudioDevice):
     def spec(self) -> AudioSpec:...
     def duplicate(self, spec_hint=None) -> "LogicalAudioDevice":...
 
+class ConversionCache:
+    @property
+    def max_bytes(self)->int:...
+    @property
+    def size(self)->int:...
+    @property
+    def hits(self)->int:...
+    @property
+    def misses(self)->int:...
+    @property
+    def evictions(self)->int:...
+    def __init__(self, max_bytes:int=64*1024*1024)->None:...
+    def __len__(self)->int:...
+    def clear(self)->None:...
+
 class Audio:
     @property
     def spec(self) -> AudioSpec:...
     @property
     def duration(self) -> float:...
+    @property
+    def n_frames(self) -> int:...
+    @classmethod
+    def from_buffer(cls, buffer:typing.Any, spec:AudioSpec)->Audio:...
+    @classmethod
+    def from_numpy(cls, array:typing.Any, sample_rate:int=48000)->Audio:...
     @classmethod
-    def from_buffer(cls, buffer:bytearray|bytes, spec:AudioSpec)->Audio:...
+    def from_raw_file(cls, filename:str, spec:AudioSpec, mmap:bool=True)->Audio:...
     @classmethod
     def from_wav_file(cls, filename:str)->Audio:...
     @classmethod
+    def iter_wav_file(cls, filename:str, chunk_frames:int=4096)->typing.Iterator[Audio]:...
+    @classmethod
     def join(cls, lst:list["Audio"])->Audio:...
-    def convert(self,spec:AudioSpec)->Audio:...
+    @classmethod
+    def concat_view(cls, lst:list["Audio"])->Audio:...
+    def __getitem__(self, key:slice)->Audio:...
+    def slice(self, start_s:float, end_s:float|None=None)->Audio:...
+    def as_memoryview(self)->memoryview:...
+    def to_numpy(self)->typing.Any:...
+    # needs Python 3.12 (PEP 688), use as_memoryview() on older versions
+    def __buffer__(self, flags:int)->memoryview:...
+    def convert(self, spec:AudioSpec, out:typing.Any|None=None, cache:ConversionCache|None=None)->Audio:...
+    def convert_async(self, spec:AudioSpec, cache:ConversionCache|None=None,
+        executor:concurrent.futures.Executor|None=None)->concurrent.futures.Future[Audio]:...
+    @classmethod
+    def convert_many(cls, audios:typing.Iterable[Audio], spec:AudioSpec,
+        max_workers:int|None=None, cache:ConversionCache|None=None)->list[Audio]:...
+
+class AudioConverter:
+    @property
+    def src_spec(self)->AudioSpec:...
+    @property
+    def dst_spec(self)->AudioSpec:...
+    def __init__(self, src_spec:AudioSpec, dst_spec:AudioSpec)->None:...
+    def feed(self, chunk:Audio|typing.Any)->None:...
+    def available_data_length(self)->int:...
+    def read(self, length:int|None=None)->Audio:...
+    def read_into(self, buf:typing.Any)->int:...
+    def flush(self)->None:...
+    def clear(self)->None:...
+
+def enable_stream_stats(enabled:bool=True)->None:...
+def enable_device_state_cache(enabled:bool=True)->None:...
+def all_stream_stats()->list[tuple[AudioStream, dict[str, typing.Any]]]:...
 
 class AudioStream:
     src_spec: AudioSpec
@@ -74,8 +131,110 @@ class AudioStream:
     def queued_data_length(self)->int:...
     def available_data_length(self)->int:...
     def put_audio(self, audio:Audio)->None:...
+    def enable_stats(self, enabled:bool=True)->None:...
+    def stats(self)->dict[str, typing.Any]|None:...
+    def set_source(self, source:typing.Callable[[int], Audio|typing.Any|None]|typing.Iterable[Audio|typing.Any]|None)->None:...
+    def play_file(self, filename:str, chunk_frames:int=4096, queued_chunks:int=4, timeout:float|None=None)->None:...
+    def wait_below(self, n_bytes:int, timeout:float|None=None)->None:...
+    def wait_drained(self, timeout:float|None=None)->None:...
+    async def aget_audio(self)->Audio:...
+    async def aput_audio(self, audio:Audio, max_queued:int|None=None)->None:...
+    async def await_below(self, n_bytes:int)->None:...
+    async def adrain(self)->None:...
     def get_audio(self) -> Audio:...
     def get_audio_nowait(self, length:int|None = None) -> Audio:...
+    def get_audio_into(self, buf:typing.Any) -> int:...
+    def set_capture_ring(self, size:int|None) -> None:...
+    @property
+    def capture_dropped_bytes(self) -> int:...
     def flush(self)->None:...
     def clear(self)->None:...
     
+
+class AudioStreamGroup:
+    def __init__(self, streams:typing.Iterable[AudioStream]):...
+    def __len__(self)->int:...
+    def __iter__(self)->typing.Iterator[AudioStream]:...
+    def __enter__(self)->AudioStreamGroup:...
+    def __exit__(self, exc_type:typing.Any, exc_value:typing.Any, traceback:typing.Any)->None:...
+    @property
+    def streams(self)->list[AudioStream]:...
+    def bind(self, device:LogicalAudioDevice)->None:...
+    def unbind(self)->None:...
+    def put_audio(self, audios:typing.Sequence[Audio])->None:...
+    def start(self, device:LogicalAudioDevice, audios:typing.Sequence[Audio])->None:...
+    def clear(self)->None:...
+    def set_gain(self, gain:float|typing.Sequence[float])->None:...
+
+class AudioStreamPool:
+    def __init__(self, max_streams:int=64, idle_timeout:float|None=30.0):...
+    def __len__(self)->int:...
+    @property
+    def max_streams(self)->int:...
+    @property
+    def hits(self)->int:...
+    @property
+    def misses(self)->int:...
+    @property
+    def evictions(self)->int:...
+    def acquire(self, device:LogicalAudioDevice, src_spec:AudioSpec|None=None)->AudioStream:...
+    def release(self, stream:AudioStream)->None:...
+    def evict_idle(self)->None:...
+    def clear(self)->None:...
+
+class Voice:
+    gain: float
+    loop: bool
+    pan: float
+    pitch: float
+    @property
+    def playing(self)->bool:...
+    def stop(self)->None:...
+
+class Mixer:
+    def __init__(self, device:LogicalAudioDevice, n_voices:int=32, cache:ConversionCache|None=None):...
+    @property
+    def spec(self)->AudioSpec:...
+    @property
+    def stream(self)->AudioStream:...
+    @property
+    def voices(self)->list[Voice]:...
+    @property
+    def n_playing(self)->int:...
+    def play(self, sound:Audio, gain:float=1.0, pan:float=0.0, pitch:float=1.0, loop:bool=False)->Voice:...
+    def stop_all(self)->None:...
+
+class PCMCache:
+    def __init__(self, directory:str, verify:bool=False):...
+    @property
+    def directory(self)->str:...
+    @property
+    def hits(self)->int:...
+    @property
+    def misses(self)->int:...
+    def load_wav(self, filename:str, spec:AudioSpec)->Audio:...
+    def clear(self)->None:...
+
+class SoundBank:
+    def __init__(self, files:dict[str, str], spec:AudioSpec, max_bytes:int|None=None,
+                 disk_cache:PCMCache|None=None):...
+    @classmethod
+    def from_directory(cls, path:str, spec:AudioSpec, max_bytes:int|None=None,
+                       extension:str=".wav", disk_cache:PCMCache|None=None)->SoundBank:...
+    @classmethod
+    def from_manifest(cls, filename:str, spec:AudioSpec, max_bytes:int|None=None,
+                      disk_cache:PCMCache|None=None)->SoundBank:...
+    def __len__(self)->int:...
+    def __contains__(self, name:str)->bool:...
+    def __iter__(self)->typing.Iterator[str]:...
+    def __getitem__(self, name:str)->Audio:...
+    @property
+    def spec(self)->AudioSpec:...
+    @property
+    def max_bytes(self)->int|None:...
+    @property
+    def size(self)->int:...
+    @property
+    def arena_size(self)->int:...
+    def preload(self, names:typing.Iterable[str]|None=None, max_workers:int|None=None)->None:...
+    def unload(self, name:str|None=None)->None:...
@@ -41,52 +41,184 @@ if typing.TYPE_CHECKING:
     SDL_AudioStreamCallback:typing.TypeAlias=ctypes._FuncPointer
 else:
     SDL_AudioStreamCallback=ctypes.CFUNCTYPE(None, ctypes.POINTER(None), ctypes.POINTER(SDL_AudioStream), ctypes.c_int, ctypes.c_int)
+SDL_EventType:typing.TypeAlias=ctypes.c_uint32
+SDL_EVENT_AUDIO_DEVICE_ADDED=SDL_EventType(4352)
+SDL_EVENT_AUDIO_DEVICE_REMOVED=SDL_EventType(4353)
+SDL_EVENT_AUDIO_DEVICE_FORMAT_CHANGED=SDL_EventType(4354)
+
+class SDL_AudioDeviceEvent(ctypes.Structure):
+    type:int
+    reserved:int
+    timestamp:int
+    which:int
+    recording:bool
+    padding1:int
+    padding2:int
+    padding3:int
+    _fields_ = [ # type: ignore
+        ("type",SDL_EventType),
+        ("reserved",ctypes.c_uint32),
+        ("timestamp",ctypes.c_uint64),
+        ("which",SDL_AudioDeviceID),
+        ("recording",ctypes.c_bool),
+        ("padding1",ctypes.c_uint8),
+        ("padding2",ctypes.c_uint8),
+        ("padding3",ctypes.c_uint8),
+    ]
+
+if typing.TYPE_CHECKING:
+    SDL_EventFilter:typing.TypeAlias=ctypes._FuncPointer
+else:
+    SDL_EventFilter=ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.POINTER(None), ctypes.POINTER(SDL_AudioDeviceEvent))
 SDL_InitFlags:typing.TypeAlias=ctypes.c_uint32
 SDL_INIT_AUDIO=SDL_InitFlags(16)
 
+_restypes = {
+    "SDL_free":None,
+    "SDL_SetPointerProperty":ctypes.c_bool,
+    "SDL_GetPointerProperty":ctypes.POINTER(None),
+    "SDL_CreateSemaphore":ctypes.POINTER(SDL_Semaphore),
+    "SDL_DestroySemaphore":None,
+    "SDL_WaitSemaphoreTimeout":ctypes.c_bool,
+    "SDL_SignalSemaphore":None,
+    "SDL_GetSemaphoreValue":ctypes.c_uint32,
+    "SDL_GetNumAudioDrivers":ctypes.c_int,
+    "SDL_GetAudioDriver":ctypes.c_char_p,
+    "SDL_GetCurrentAudioDriver":ctypes.c_char_p,
+    "SDL_GetAudioRecordingDevices":ctypes.POINTER(SDL_AudioDeviceID),
+    "SDL_GetAudioPlaybackDevices":ctypes.POINTER(SDL_AudioDeviceID),
+    "SDL_GetAudioDeviceName":ctypes.c_char_p,
+    "SDL_GetAudioDeviceFormat":ctypes.c_bool,
+    "SDL_OpenAudioDevice":SDL_AudioDeviceID,
+    "SDL_PauseAudioDevice":ctypes.c_bool,
+    "SDL_ResumeAudioDevice":ctypes.c_bool,
+    "SDL_AudioDevicePaused":ctypes.c_bool,
+    "SDL_GetAudioDeviceGain":ctypes.c_float,
+    "SDL_SetAudioDeviceGain":ctypes.c_bool,
+    "SDL_CloseAudioDevice":None,
+    "SDL_BindAudioStream":ctypes.c_bool,
+    "SDL_UnbindAudioStream":None,
+    "SDL_BindAudioStreams":ctypes.c_bool,
+    "SDL_UnbindAudioStreams":None,
+    "SDL_GetAudioStreamDevice":SDL_AudioDeviceID,
+    "SDL_CreateAudioStream":ctypes.POINTER(SDL_AudioStream),
+    "SDL_GetAudioStreamProperties":SDL_PropertiesID,
+    "SDL_GetAudioStreamFormat":ctypes.c_bool,
+    "SDL_SetAudioStreamFormat":ctypes.c_bool,
+    "SDL_GetAudioStreamGain":ctypes.c_float,
+    "SDL_SetAudioStreamGain":ctypes.c_bool,
+    "SDL_GetAudioStreamFrequencyRatio":ctypes.c_float,
+    "SDL_SetAudioStreamFrequencyRatio":ctypes.c_bool,
+    "SDL_PutAudioStreamData":ctypes.c_bool,
+    "SDL_GetAudioStreamData":ctypes.c_int,
+    "SDL_GetAudioStreamAvailable":ctypes.c_int,
+    "SDL_GetAudioStreamQueued":ctypes.c_int,
+    "SDL_FlushAudioStream":ctypes.c_bool,
+    "SDL_ClearAudioStream":ctypes.c_bool,
+    "SDL_SetAudioStreamGetCallback":ctypes.c_bool,
+    "SDL_SetAudioStreamPutCallback":ctypes.c_bool,
+    "SDL_LockAudioStream":ctypes.c_bool,
+    "SDL_UnlockAudioStream":ctypes.c_bool,
+    "SDL_DestroyAudioStream":None,
+    "SDL_LoadWAV":ctypes.c_bool,
+    "SDL_MixAudio":ctypes.c_bool,
+    "SDL_ConvertAudioSamples":ctypes.c_bool,
+    "SDL_AddEventWatch":ctypes.c_bool,
+    "SDL_RemoveEventWatch":None,
+    "SDL_GetError":ctypes.c_char_p,
+    "SDL_Init":ctypes.c_bool,
+    "SDL_WasInit":SDL_InitFlags,
+    "SDL_Quit":None,
+}
+
+_argtypes = {
+    "SDL_free":(ctypes.c_void_p, ),
+    "SDL_SetPointerProperty":(SDL_PropertiesID, ctypes.c_char_p, ctypes.POINTER(None), ),
+    "SDL_GetPointerProperty":(SDL_PropertiesID, ctypes.c_char_p, ctypes.POINTER(None), ),
+    "SDL_CreateSemaphore":(ctypes.c_uint32, ),
+    "SDL_DestroySemaphore":(ctypes.POINTER(SDL_Semaphore), ),
+    "SDL_WaitSemaphoreTimeout":(ctypes.POINTER(SDL_Semaphore), ctypes.c_int32, ),
+    "SDL_SignalSemaphore":(ctypes.POINTER(SDL_Semaphore), ),
+    "SDL_GetSemaphoreValue":(ctypes.POINTER(SDL_Semaphore), ),
+    "SDL_GetNumAudioDrivers":(),
+    "SDL_GetAudioDriver":(ctypes.c_int, ),
+    "SDL_GetCurrentAudioDriver":(),
+    "SDL_GetAudioRecordingDevices":(ctypes.POINTER(ctypes.c_int), ),
+    "SDL_GetAudioPlaybackDevices":(ctypes.POINTER(ctypes.c_int), ),
+    "SDL_GetAudioDeviceName":(SDL_AudioDeviceID, ),
+    "SDL_GetAudioDeviceFormat":(SDL_AudioDeviceID, ctypes.POINTER(SDL_AudioSpec), ctypes.POINTER(ctypes.c_int), ),
+    "SDL_OpenAudioDevice":(SDL_AudioDeviceID, ctypes.POINTER(SDL_AudioSpec), ),
+    "SDL_PauseAudioDevice":(SDL_AudioDeviceID, ),
+    "SDL_ResumeAudioDevice":(SDL_AudioDeviceID, ),
+    "SDL_AudioDevicePaused":(SDL_AudioDeviceID, ),
+    "SDL_GetAudioDeviceGain":(SDL_AudioDeviceID, ),
+    "SDL_SetAudioDeviceGain":(SDL_AudioDeviceID, ctypes.c_float, ),
+    "SDL_CloseAudioDevice":(SDL_AudioDeviceID, ),
+    "SDL_BindAudioStream":(SDL_AudioDeviceID, ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_UnbindAudioStream":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_BindAudioStreams":(SDL_AudioDeviceID, ctypes.POINTER(ctypes.POINTER(SDL_AudioStream)), ctypes.c_int, ),
+    "SDL_UnbindAudioStreams":(ctypes.POINTER(ctypes.POINTER(SDL_AudioStream)), ctypes.c_int, ),
+    "SDL_GetAudioStreamDevice":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_CreateAudioStream":(ctypes.POINTER(SDL_AudioSpec), ctypes.POINTER(SDL_AudioSpec), ),
+    "SDL_GetAudioStreamProperties":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_GetAudioStreamFormat":(ctypes.POINTER(SDL_AudioStream), ctypes.POINTER(SDL_AudioSpec), ctypes.POINTER(SDL_AudioSpec), ),
+    "SDL_SetAudioStreamFormat":(ctypes.POINTER(SDL_AudioStream), ctypes.POINTER(SDL_AudioSpec), ctypes.POINTER(SDL_AudioSpec), ),
+    "SDL_GetAudioStreamGain":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_SetAudioStreamGain":(ctypes.POINTER(SDL_AudioStream), ctypes.c_float, ),
+    "SDL_GetAudioStreamFrequencyRatio":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_SetAudioStreamFrequencyRatio":(ctypes.POINTER(SDL_AudioStream), ctypes.c_float, ),
+    "SDL_PutAudioStreamData":(ctypes.POINTER(SDL_AudioStream), ctypes.c_void_p, ctypes.c_int, ),
+    "SDL_GetAudioStreamData":(ctypes.POINTER(SDL_AudioStream), ctypes.c_void_p, ctypes.c_int, ),
+    "SDL_GetAudioStreamAvailable":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_GetAudioStreamQueued":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_FlushAudioStream":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_ClearAudioStream":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_SetAudioStreamGetCallback":(ctypes.POINTER(SDL_AudioStream), SDL_AudioStreamCallback, ctypes.c_void_p, ),
+    "SDL_SetAudioStreamPutCallback":(ctypes.POINTER(SDL_AudioStream), SDL_AudioStreamCallback, ctypes.c_void_p, ),
+    "SDL_LockAudioStream":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_UnlockAudioStream":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_DestroyAudioStream":(ctypes.POINTER(SDL_AudioStream), ),
+    "SDL_LoadWAV":(ctypes.c_char_p, ctypes.POINTER(SDL_AudioSpec), ctypes.POINTER(ctypes.POINTER(ctypes.c_uint8)), ctypes.POINTER(ctypes.c_uint32), ),
+    "SDL_MixAudio":(ctypes.c_void_p, ctypes.c_void_p, SDL_AudioFormat, ctypes.c_uint32, ctypes.c_float, ),
+    "SDL_ConvertAudioSamples":(ctypes.POINTER(SDL_AudioSpec), ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(SDL_AudioSpec), ctypes.POINTER(ctypes.POINTER(ctypes.c_uint8)), ctypes.POINTER(ctypes.c_int), ),
+    "SDL_AddEventWatch":(SDL_EventFilter, ctypes.c_void_p, ),
+    "SDL_RemoveEventWatch":(SDL_EventFilter, ctypes.c_void_p, ),
+    "SDL_GetError":(),
+    "SDL_Init":(SDL_InitFlags, ),
+    "SDL_WasInit":(SDL_InitFlags, ),
+    "SDL_Quit":(),
+}
+
+# functions marked with @hot in the stub
+_hot_functions = (
+    "SDL_GetPointerProperty",
+    "SDL_WaitSemaphoreTimeout",
+    "SDL_SignalSemaphore",
+    "SDL_GetSemaphoreValue",
+    "SDL_GetAudioStreamProperties",
+    "SDL_PutAudioStreamData",
+    "SDL_GetAudioStreamData",
+    "SDL_GetAudioStreamAvailable",
+    "SDL_GetAudioStreamQueued",
+)
+
+class SDL3DLL(ctypes.CDLL):
+    # Functions are looked up and configured on first use only,
+    # then cached as attributes like CDLL does
+    def __getattr__(self, name):
+        if name not in _restypes:
+            return super().__getattr__(name)
+        func = self[name]
+        func.restype = _restypes[name]
+        func.argtypes = _argtypes[name]
+        setattr(self, name, func)
+        return func
+
 def load_sdl3_dll(sdl_dll_path):
-    sdl3 = ctypes.cdll.LoadLibrary(sdl_dll_path)
-    sdl3.SDL_SetPointerProperty.restype = ctypes.c_bool
-    sdl3.SDL_GetPointerProperty.restype = ctypes.POINTER(None)
-    sdl3.SDL_CreateSemaphore.restype = ctypes.POINTER(SDL_Semaphore)
-    sdl3.SDL_WaitSemaphoreTimeout.restype = ctypes.c_bool
-    sdl3.SDL_GetSemaphoreValue.restype = ctypes.c_uint32
-    sdl3.SDL_GetNumAudioDrivers.restype = ctypes.c_int
-    sdl3.SDL_GetAudioDriver.restype = ctypes.c_char_p
-    sdl3.SDL_GetCurrentAudioDriver.restype = ctypes.c_char_p
-    sdl3.SDL_GetAudioRecordingDevices.restype = ctypes.POINTER(SDL_AudioDeviceID)
-    sdl3.SDL_GetAudioPlaybackDevices.restype = ctypes.POINTER(SDL_AudioDeviceID)
-    sdl3.SDL_GetAudioDeviceName.restype = ctypes.c_char_p
-    sdl3.SDL_GetAudioDeviceFormat.restype = ctypes.c_bool
-    sdl3.SDL_OpenAudioDevice.restype = SDL_AudioDeviceID
-    sdl3.SDL_PauseAudioDevice.restype = ctypes.c_bool
-    sdl3.SDL_ResumeAudioDevice.restype = ctypes.c_bool
-    sdl3.SDL_AudioDevicePaused.restype = ctypes.c_bool
-    sdl3.SDL_GetAudioDeviceGain.restype = ctypes.c_float
-    sdl3.SDL_SetAudioDeviceGain.restype = ctypes.c_bool
-    sdl3.SDL_BindAudioStream.restype = ctypes.c_bool
-    sdl3.SDL_GetAudioStreamDevice.restype = SDL_AudioDeviceID
-    sdl3.SDL_CreateAudioStream.restype = ctypes.POINTER(SDL_AudioStream)
-    sdl3.SDL_GetAudioStreamProperties.restype = SDL_PropertiesID
-    sdl3.SDL_GetAudioStreamFormat.restype = ctypes.c_bool
-    sdl3.SDL_SetAudioStreamFormat.restype = ctypes.c_bool
-    sdl3.SDL_GetAudioStreamGain.restype = ctypes.c_float
-    sdl3.SDL_SetAudioStreamGain.restype = ctypes.c_bool
-    sdl3.SDL_GetAudioStreamFrequencyRatio.restype = ctypes.c_float
-    sdl3.SDL_SetAudioStreamFrequencyRatio.restype = ctypes.c_bool
-    sdl3.SDL_PutAudioStreamData.restype = ctypes.c_bool
-    sdl3.SDL_GetAudioStreamData.restype = ctypes.c_int
-    sdl3.SDL_GetAudioStreamAvailable.restype = ctypes.c_int
-    sdl3.SDL_GetAudioStreamQueued.restype = ctypes.c_int
-    sdl3.SDL_FlushAudioStream.restype = ctypes.c_bool
-    sdl3.SDL_ClearAudioStream.restype = ctypes.c_bool
-    sdl3.SDL_SetAudioStreamGetCallback.restype = ctypes.c_bool
-    sdl3.SDL_SetAudioStreamPutCallback.restype = ctypes.c_bool
-    sdl3.SDL_LoadWAV.restype = ctypes.c_bool
-    sdl3.SDL_MixAudio.restype = ctypes.c_bool
-    sdl3.SDL_ConvertAudioSamples.restype = ctypes.c_bool
-    sdl3.SDL_GetError.restype = ctypes.c_char_p
-    sdl3.SDL_Init.restype = ctypes.c_bool
-    sdl3.SDL_WasInit.restype = SDL_InitFlags
+    return SDL3DLL(sdl_dll_path)
 
-    return sdl3
+def prebind(sdl3, namespace):
+    # Stores the hot functions in 'namespace', usually the globals()
+    # of a module, so calling them skips the attribute lookup
+    for name in _hot_functions:
+        namespace[name] = getattr(sdl3, name)
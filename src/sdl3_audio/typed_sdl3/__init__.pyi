@@ -43,6 +43,35 @@ if typing.TYPE_CHECKING:
     SDL_AudioStreamCallback:typing.TypeAlias=ctypes._FuncPointer
 else:
     SDL_AudioStreamCallback=ctypes.CFUNCTYPE(None, ctypes.POINTER(None), ctypes.POINTER(SDL_AudioStream), ctypes.c_int, ctypes.c_int)
+SDL_EventType:typing.TypeAlias=ctypes.c_uint32
+SDL_EVENT_AUDIO_DEVICE_ADDED=SDL_EventType(4352)
+SDL_EVENT_AUDIO_DEVICE_REMOVED=SDL_EventType(4353)
+SDL_EVENT_AUDIO_DEVICE_FORMAT_CHANGED=SDL_EventType(4354)
+
+class SDL_AudioDeviceEvent(ctypes.Structure):
+    type:int
+    reserved:int
+    timestamp:int
+    which:int
+    recording:bool
+    padding1:int
+    padding2:int
+    padding3:int
+    _fields_ = [ # type: ignore
+        ("type",SDL_EventType),
+        ("reserved",ctypes.c_uint32),
+        ("timestamp",ctypes.c_uint64),
+        ("which",SDL_AudioDeviceID),
+        ("recording",ctypes.c_bool),
+        ("padding1",ctypes.c_uint8),
+        ("padding2",ctypes.c_uint8),
+        ("padding3",ctypes.c_uint8),
+    ]
+
+if typing.TYPE_CHECKING:
+    SDL_EventFilter:typing.TypeAlias=ctypes._FuncPointer
+else:
+    SDL_EventFilter=ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.POINTER(None), ctypes.POINTER(SDL_AudioDeviceEvent))
 SDL_InitFlags:typing.TypeAlias=ctypes.c_uint32
 SDL_INIT_AUDIO=SDL_InitFlags(16)
 
@@ -71,6 +100,8 @@ class SDL3DLL(ctypes.CDLL):
     def SDL_CloseAudioDevice(self,devid:SDL_AudioDeviceID,)->None:...
     def SDL_BindAudioStream(self,devid:SDL_AudioDeviceID,stream:ctypes._Pointer[SDL_AudioStream],)->bool:...
     def SDL_UnbindAudioStream(self,stream:ctypes._Pointer[SDL_AudioStream],)->None:...
+    def SDL_BindAudioStreams(self,devid:SDL_AudioDeviceID,streams:ctypes._Pointer[ctypes._Pointer[SDL_AudioStream]],num_streams:ctypes.c_int,)->bool:...
+    def SDL_UnbindAudioStreams(self,streams:ctypes._Pointer[ctypes._Pointer[SDL_AudioStream]],num_streams:ctypes.c_int,)->None:...
     def SDL_GetAudioStreamDevice(self,stream:ctypes._Pointer[SDL_AudioStream],)->int:...
     def SDL_CreateAudioStream(self,src_spec:ctypes._Pointer[SDL_AudioSpec],dst_spec:ctypes._Pointer[SDL_AudioSpec],)->ctypes._Pointer[SDL_AudioStream]:...
     def SDL_GetAudioStreamProperties(self,stream:ctypes._Pointer[SDL_AudioStream],)->int:...
@@ -88,12 +119,18 @@ class SDL3DLL(ctypes.CDLL):
     def SDL_ClearAudioStream(self,stream:ctypes._Pointer[SDL_AudioStream],)->bool:...
     def SDL_SetAudioStreamGetCallback(self,stream:ctypes._Pointer[SDL_AudioStream],callback:SDL_AudioStreamCallback,userdata:ctypes._Pointer,)->bool:...
     def SDL_SetAudioStreamPutCallback(self,stream:ctypes._Pointer[SDL_AudioStream],callback:SDL_AudioStreamCallback,userdata:ctypes._Pointer,)->bool:...
+    def SDL_LockAudioStream(self,stream:ctypes._Pointer[SDL_AudioStream],)->bool:...
+    def SDL_UnlockAudioStream(self,stream:ctypes._Pointer[SDL_AudioStream],)->bool:...
     def SDL_DestroyAudioStream(self,stream:ctypes._Pointer[SDL_AudioStream],)->None:...
     def SDL_LoadWAV(self,path:ctypes.c_char_p,spec:ctypes._Pointer[SDL_AudioSpec],audio_buf:ctypes._Pointer[ctypes._Pointer[ctypes.c_uint8]],audio_len:ctypes._Pointer[ctypes.c_uint32],)->bool:...
-    def SDL_MixAudio(self,dst:ctypes._Pointer[ctypes.c_uint8],src:ctypes._Pointer[ctypes.c_uint8],format:SDL_AudioFormat,len:ctypes.c_uint32,volume:ctypes.c_float,)->bool:...
-    def SDL_ConvertAudioSamples(self,src_spec:ctypes._Pointer[SDL_AudioSpec],src_data:ctypes._Pointer[ctypes.c_uint8],src_len:ctypes.c_int,dst_spec:ctypes._Pointer[SDL_AudioSpec],dst_data:ctypes._Pointer[ctypes._Pointer[ctypes.c_uint8]],dst_len:ctypes._Pointer[ctypes.c_int],)->bool:...
+    def SDL_MixAudio(self,dst:ctypes._Pointer,src:ctypes._Pointer,format:SDL_AudioFormat,len:ctypes.c_uint32,volume:ctypes.c_float,)->bool:...
+    def SDL_ConvertAudioSamples(self,src_spec:ctypes._Pointer[SDL_AudioSpec],src_data:ctypes._Pointer,src_len:ctypes.c_int,dst_spec:ctypes._Pointer[SDL_AudioSpec],dst_data:ctypes._Pointer[ctypes._Pointer[ctypes.c_uint8]],dst_len:ctypes._Pointer[ctypes.c_int],)->bool:...
+    def SDL_AddEventWatch(self,filter:SDL_EventFilter,userdata:ctypes._Pointer,)->bool:...
+    def SDL_RemoveEventWatch(self,filter:SDL_EventFilter,userdata:ctypes._Pointer,)->None:...
     def SDL_GetError(self,)->bytes|None:...
     def SDL_Init(self,flags:SDL_InitFlags,)->bool:...
     def SDL_WasInit(self,flags:SDL_InitFlags,)->int:...
     def SDL_Quit(self,)->None:...
 
+
+def prebind(sdl3:SDL3DLL, namespace:dict[str, typing.Any]) -> None:...
@@ -67,6 +67,8 @@ class SDL3DLL(ctypes.CDLL):
 {% endfor %})->{{def.returns}}:...
 {% endfor %}
 
+def prebind(sdl3:SDL3DLL, namespace:dict[str, typing.Any]) -> None:...
+
 """)
 py_template = jinja2.Template("""# This file is auto generated
 import ctypes
@@ -74,14 +76,47 @@ import typing
 
 {{ const_and_type_def }}
 
-def load_sdl3_dll(sdl_dll_path):
-    sdl3 = ctypes.cdll.LoadLibrary(sdl_dll_path)
+_restypes = {
 {% for def in func_def %}\
-{% if def.restype!="None"%}\
-    sdl3.{{ def.name }}.restype = {{ def.restype }}
-{% endif%}\
-{% endfor %}
-    return sdl3
+    "{{ def.name }}":{{ def.restype }},
+{% endfor %}\
+}
+
+_argtypes = {
+{% for def in func_def %}\
+    "{{ def.name }}":({% for typ in def.argtypes %}{{ typ }}, {% endfor %}),
+{% endfor %}\
+}
+
+# functions marked with @hot in the stub
+_hot_functions = (
+{% for def in func_def %}\
+{% if def.hot %}\
+    "{{ def.name }}",
+{% endif %}\
+{% endfor %}\
+)
+
+class SDL3DLL(ctypes.CDLL):
+    # Functions are looked up and configured on first use only,
+    # then cached as attributes like CDLL does
+    def __getattr__(self, name):
+        if name not in _restypes:
+            return super().__getattr__(name)
+        func = self[name]
+        func.restype = _restypes[name]
+        func.argtypes = _argtypes[name]
+        setattr(self, name, func)
+        return func
+
+def load_sdl3_dll(sdl_dll_path):
+    return SDL3DLL(sdl_dll_path)
+
+def prebind(sdl3, namespace):
+    # Stores the hot functions in 'namespace', usually the globals()
+    # of a module, so calling them skips the attribute lookup
+    for name in _hot_functions:
+        namespace[name] = getattr(sdl3, name)
 
 """)
 struct_template = jinja2.Template("""
@@ -118,6 +153,20 @@ def get_type_str(node):
     else:
         raise RuntimeError()
 
+def get_argtype(node):
+    if isinstance(node, ast.Name):
+        if node.id=="p":
+            return "ctypes.c_void_p"
+        if node.id in type_dict:
+            return type_dict[node.id]
+        else:
+            return node.id
+    elif isinstance(node, ast.Subscript):
+        assert isinstance(node.value,ast.Name) and node.value.id=="p"
+        return f"ctypes.POINTER({get_argtype(node.slice)})"
+    else:
+        raise RuntimeError()
+
 def get_restype(node):
     if isinstance(node, ast.Name):
         if node.id in type_dict:
@@ -135,6 +184,8 @@ class FuncDef:
     args:list[tuple[str,str]]
     returns:str
     restype:str
+    argtypes:list[str]
+    hot:bool
 
 class StructFieldDef:
     name: str
@@ -201,10 +252,16 @@ for def_ in load_stub(os.path.join(dir_name,"sdl3.pyi.in")):
             f_def.returns = get_type_str(def_.returns)
             
         f_def.args = []
+        f_def.argtypes = []
         assert isinstance(def_.args,ast.arguments)
         for _arg in def_.args.args:
             assert isinstance(_arg,ast.arg)
             f_def.args.append((_arg.arg, get_type_str(_arg.annotation)))
+            f_def.argtypes.append(get_argtype(_arg.annotation))
+        f_def.hot = any(
+            isinstance(dec, ast.Name) and dec.id=="hot"
+            for dec in def_.decorator_list
+        )
 
         function_def.append(f_def)
     elif isinstance(def_, ast.ClassDef):
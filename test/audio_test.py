@@ -1,11 +1,31 @@
+import asyncio
+import ctypes
 import unittest
 import os
 import random
+import subprocess
+import sys
+import tempfile
+import time
+try:
+    import numpy
+except ImportError:
+    numpy = None
 os.environ["SDL_AUDIO_DRIVER"]="dummy"
 
 import sdl3_audio.audio as audio
 audio._init_library(os.environ["SDL3_DLL_PATH"])
 
+SAMPLE_WAV = os.path.join(os.path.dirname(__file__), "..", "resources", "sample.wav")
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic()+timeout
+    while not predicate():
+        if time.monotonic()>deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
 class AudioTest(unittest.TestCase):
     """Test cases of functions in audio module"""
 
@@ -16,6 +36,28 @@ class AudioTest(unittest.TestCase):
         self.assertEqual(audio.dB(+10.0), 10.0)
         self.assertEqual(audio.dB(+20.0), 100.0)
 
+    def test_deferred_audio_init(self):
+        # loading and converting audio never initializes the audio subsystem
+        script = (
+            "import os, sdl3_audio.audio as audio;"
+            "audio._init_library(os.environ['SDL3_DLL_PATH']);"
+            "spec = audio.AudioSpec('S16LE', 2, 44100);"
+            "audio.Audio.from_buffer(bytes(64), spec).convert(audio.AudioSpec('F32LE', 1, 48000));"
+            "print(audio.sdl3.SDL_WasInit(audio.SDL_INIT_AUDIO)!=0);"
+            "audio.open_default_playback_device();"
+            "print(audio.sdl3.SDL_WasInit(audio.SDL_INIT_AUDIO)!=0)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", script],
+            check=True, capture_output=True, text=True
+        ).stdout.split()
+        self.assertEqual(out, ["False", "True"])
+
+    def test_prebound_functions(self):
+        self.assertIs(audio.SDL_PutAudioStreamData, audio.sdl3.SDL_PutAudioStreamData)
+        self.assertEqual(len(audio.SDL_PutAudioStreamData.argtypes), 3)
+        self.assertEqual(audio.sdl3.SDL_GetAudioStreamGain.argtypes, (ctypes.POINTER(audio.SDL_AudioStream),))
+
     def test_list_audio_drivers(self):
         result = audio.list_audio_drivers()
         self.assertIsInstance(result, list)
@@ -369,9 +411,1033 @@ class LogicalAudioDeviceTest(unittest.TestCase, _AudioDeviceTest):
             TypeError,
             lambda: setattr(self.testing_logical_audio_device, "gain", "STRRR")
         )
-    
-    
-        
+
+class AudioClassTest(unittest.TestCase):
+    """Test cases of audio.Audio class"""
+
+    def test_from_wav_file(self):
+        au = audio.Audio.from_wav_file(SAMPLE_WAV)
+        self.assertIsInstance(au, audio.Audio)
+        self.assertIsInstance(au.spec, audio.AudioSpec)
+        self.assertGreater(au.duration, 0)
+
+        self.assertRaises(
+            audio.SDLError,
+            lambda: audio.Audio.from_wav_file("NOT EXISTING FILE.wav")
+        )
+
+    def test_convert(self):
+        au = audio.Audio.from_wav_file(SAMPLE_WAV)
+        spec = audio.AudioSpec("S16LE", 1, 22050)
+        converted = au.convert(spec)
+        self.assertIsInstance(converted, audio.Audio)
+        self.assertEqual(converted.spec, spec)
+        self.assertAlmostEqual(converted.duration, au.duration, places=2)
+
+        # Same spec should keep the samples untouched
+        same = au.convert(au.spec)
+        self.assertEqual(same._buffer[:], au._buffer[:])
+
+    def test_convert_out(self):
+        au = audio.Audio.from_wav_file(SAMPLE_WAV)
+        spec = audio.AudioSpec("F32LE", 2, 48000)
+        expected = au.convert(spec)
+
+        out = bytearray(len(expected._buffer)+16)
+        converted = au.convert(spec, out=out)
+        self.assertEqual(converted.spec, spec)
+        self.assertEqual(converted._buffer[:], expected._buffer[:])
+        # The result should be written into 'out'
+        self.assertEqual(bytes(out[:len(expected._buffer)]), expected._buffer[:])
+
+        # 'out' is too small
+        self.assertRaises(
+            ValueError,
+            lambda: au.convert(spec, out=bytearray(16))
+        )
+        # 'out' is not writable
+        self.assertRaises(
+            TypeError,
+            lambda: au.convert(spec, out=bytes(len(out)))
+        )
+
+    def test_from_buffer(self):
+        spec = audio.AudioSpec("S16LE", 2)
+        buf = bytearray(spec.frame_size*100)
+        au = audio.Audio.from_buffer(buf, spec)
+        self.assertEqual(au.spec, spec)
+        self.assertAlmostEqual(au.duration, 100/spec.sample_rate)
+
+        # A writable buffer should be shared, not copied
+        au.as_memoryview()[0, 0] = 1234
+        self.assertEqual(buf[:2], (1234).to_bytes(2, "little"))
+
+        # A read-only buffer is shared as well, but stays read-only
+        data = bytes(buf)
+        au = audio.Audio.from_buffer(data, spec)
+        self.assertEqual(au.as_memoryview()[0, 0], 1234)
+        self.assertEqual(ctypes.addressof(au._buffer), ctypes.cast(data, ctypes.c_void_p).value)
+        self.assertTrue(au.as_memoryview().readonly)
+        self.assertTrue(au[1:3].as_memoryview().readonly)
+
+        # The source is kept alive by the Audio
+        au = audio.Audio.from_buffer(bytes(range(8)), spec)
+        self.assertEqual(au.as_memoryview().tobytes(), bytes(range(8)))
+
+        # The size should be a multiple of the frame size
+        self.assertRaises(
+            ValueError,
+            lambda: audio.Audio.from_buffer(bytearray(3), spec)
+        )
+        self.assertRaises(
+            TypeError,
+            lambda: audio.Audio.from_buffer("NOT A BUFFER", spec) # type: ignore
+        )
+
+    def test_as_memoryview(self):
+        codes = {"U8":"B", "S8":"b", "S16LE":"h", "S32LE":"i", "F32LE":"f"}
+        for fmt, code in codes.items():
+            spec = audio.AudioSpec(fmt, 3)
+            au = audio.Audio.from_buffer(bytearray(spec.frame_size*10), spec)
+            view = au.as_memoryview()
+            self.assertEqual(view.format, code)
+            self.assertEqual(view.shape, (10, 3))
+
+        # Non-native byte order falls back to raw bytes per frame
+        spec = audio.AudioSpec("S16BE", 2)
+        view = audio.Audio.from_buffer(bytearray(40), spec).as_memoryview()
+        self.assertEqual(view.format, "B")
+        self.assertEqual(view.shape, (10, 4))
+
+    def test___buffer__(self):
+        spec = audio.AudioSpec("S16LE", 2)
+        au = audio.Audio.from_buffer(bytearray(spec.frame_size*10), spec)
+        if sys.version_info<(3, 12):
+            # Python classes can implement the buffer protocol since 3.12
+            self.assertRaises(TypeError, lambda: memoryview(au))
+            return
+        view = memoryview(au)
+        self.assertEqual(view.shape, (10, 2))
+        self.assertEqual(view.format, "h")
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_to_numpy(self):
+        spec = audio.AudioSpec("S16LE", 2)
+        buf = bytearray(spec.frame_size*10)
+        array = audio.Audio.from_buffer(buf, spec).to_numpy()
+        self.assertEqual(array.shape, (10, 2))
+        self.assertEqual(array.dtype, numpy.dtype("<i2"))
+
+        # Should be a view of the samples
+        array[0, 1] = -1
+        self.assertEqual(buf[2:4], b"\xff\xff")
+
+        spec = audio.AudioSpec("F32BE", 1)
+        array = audio.Audio.from_buffer(bytearray(16), spec).to_numpy()
+        self.assertEqual(array.dtype, numpy.dtype(">f4"))
+
+        # Samples of a read-only buffer give a read-only array
+        array = audio.Audio.from_buffer(bytes(16), spec).to_numpy()
+        self.assertFalse(array.flags.writeable)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_from_numpy(self):
+        array = numpy.zeros((100, 2), dtype=numpy.float32)
+        au = audio.Audio.from_numpy(array, 44100)
+        self.assertEqual(au.spec, audio.AudioSpec("F32LE", 2, 44100))
+
+        # Memory should be shared with a contiguous array
+        au.to_numpy()[5, 0] = 0.5
+        self.assertEqual(array[5, 0], 0.5)
+
+        au = audio.Audio.from_numpy(numpy.zeros(100, dtype=numpy.int16))
+        self.assertEqual(au.spec, audio.AudioSpec("S16LE", 1, 48000))
+
+        self.assertRaises(
+            TypeError,
+            lambda: audio.Audio.from_numpy(numpy.zeros(100, dtype=numpy.int64))
+        )
+        self.assertRaises(
+            ValueError,
+            lambda: audio.Audio.from_numpy(numpy.zeros((2, 2, 2), dtype=numpy.int16))
+        )
+
+    def test_iter_wav_file(self):
+        whole = audio.Audio.from_wav_file(SAMPLE_WAV)
+        chunks = list(audio.Audio.iter_wav_file(SAMPLE_WAV, chunk_frames=1000))
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertEqual(chunk.spec, whole.spec)
+            self.assertLessEqual(len(chunk._buffer), 1000*whole.spec.frame_size)
+        self.assertEqual(
+            b"".join(chunk._buffer[:] for chunk in chunks),
+            whole._buffer[:]
+        )
+
+        self.assertRaises(
+            ValueError,
+            lambda: list(audio.Audio.iter_wav_file(__file__))
+        )
+        self.assertRaises(
+            ValueError,
+            lambda: list(audio.Audio.iter_wav_file(SAMPLE_WAV, chunk_frames=0))
+        )
+
+    def test_from_raw_file(self):
+        spec = audio.AudioSpec("S16LE", 2)
+        data = bytes(range(256))*16
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "raw.pcm")
+            with open(filename, "wb") as f:
+                f.write(data)
+
+            for use_mmap in (True, False):
+                au = audio.Audio.from_raw_file(filename, spec, mmap=use_mmap)
+                self.assertEqual(au.spec, spec)
+                self.assertEqual(au._buffer[:], data)
+                del au
+
+            with open(filename, "ab") as f:
+                f.write(b"\x00")
+            self.assertRaises(
+                ValueError,
+                lambda: audio.Audio.from_raw_file(filename, spec)
+            )
+
+    def test_convert_async(self):
+        au = audio.Audio.from_wav_file(SAMPLE_WAV)
+        spec = audio.AudioSpec("F32LE", 2, 48000)
+        future = au.convert_async(spec)
+        converted = future.result(timeout=10)
+        self.assertEqual(converted.spec, spec)
+        self.assertEqual(converted._buffer[:], au.convert(spec)._buffer[:])
+
+    def test_convert_many(self):
+        au = audio.Audio.from_wav_file(SAMPLE_WAV)
+        spec = audio.AudioSpec("S16LE", 1, 22050)
+        sources = [au, au.convert(audio.AudioSpec("F32LE", 2, 48000)), au]
+        expected = [src.convert(spec)._buffer[:] for src in sources]
+        for max_workers in (None, 1, 4):
+            results = audio.Audio.convert_many(sources, spec, max_workers=max_workers)
+            self.assertEqual(len(results), len(sources))
+            for result, data in zip(results, expected):
+                self.assertEqual(result.spec, spec)
+                self.assertEqual(result._buffer[:], data)
+
+    def test_join(self):
+        spec = audio.AudioSpec("S16LE", 1)
+        parts = [audio.Audio.from_buffer(bytes([i])*(2*i+2), spec) for i in range(5)]
+        joined = audio.Audio.join(parts)
+        self.assertEqual(joined.spec, spec)
+        self.assertEqual(
+            joined._buffer[:],
+            b"".join(part._buffer[:] for part in parts)
+        )
+
+        self.assertRaises(
+            ValueError,
+            lambda: audio.Audio.join([])
+        )
+        self.assertRaises(
+            ValueError,
+            lambda: audio.Audio.join([parts[0], audio.Audio.from_buffer(bytes(4), audio.AudioSpec("F32LE", 1))])
+        )
+
+    def test_concat_view(self):
+        au = audio.Audio.from_wav_file(SAMPLE_WAV)
+        view = audio.Audio.concat_view([au, au, audio.Audio.concat_view([au])])
+        self.assertEqual(view.spec, au.spec)
+        self.assertAlmostEqual(view.duration, 3*au.duration)
+
+        joined = audio.Audio.join([au, au, au])
+        self.assertEqual(audio.Audio.join([view])._buffer[:], joined._buffer[:])
+
+        spec = audio.AudioSpec("F32LE", 2, 48000)
+        self.assertEqual(view.convert(spec)._buffer[:], joined.convert(spec)._buffer[:])
+
+        stream = audio.AudioStream(None, au.spec, au.spec)
+        stream.put_audio(view)
+        self.assertEqual(stream.available_data_length(), len(joined._buffer))
+
+        # the joined samples are a copy, so they can't be written to
+        self.assertTrue(view.as_memoryview().readonly)
+        self.assertTrue(view[10:20].as_memoryview().readonly)
+        if numpy is not None:
+            self.assertFalse(view.to_numpy().flags.writeable)
+
+        self.assertRaises(
+            ValueError,
+            lambda: audio.Audio.concat_view([au, joined.convert(spec)])
+        )
+
+    def test___getitem__(self):
+        spec = audio.AudioSpec("S16LE", 2, 1000)
+        buf = bytearray(range(40))
+        au = audio.Audio.from_buffer(buf, spec)
+        self.assertEqual(au.n_frames, 10)
+
+        part = au[2:5]
+        self.assertEqual(part.spec, spec)
+        self.assertEqual(part.n_frames, 3)
+        self.assertEqual(part._buffer[:], bytes(buf[8:20]))
+        self.assertEqual(au[-2:]._buffer[:], bytes(buf[32:]))
+        self.assertEqual(au[5:2].n_frames, 0)
+
+        # Slices share the memory of the parent
+        part.as_memoryview()[0, 0] = 0
+        self.assertEqual(buf[8:10], b"\x00\x00")
+
+        # Views are accepted anywhere an Audio is
+        converted = part.convert(audio.AudioSpec("F32LE", 2, 1000))
+        self.assertEqual(converted.n_frames, 3)
+
+        self.assertRaises(TypeError, lambda: au[1])
+        self.assertRaises(ValueError, lambda: au[::2])
+
+    def test_slice(self):
+        au = audio.Audio.from_wav_file(SAMPLE_WAV)
+        rate = au.spec.sample_rate
+        part = au.slice(0.5, 1.0)
+        self.assertEqual(part.n_frames, round(1.0*rate)-round(0.5*rate))
+        self.assertEqual(part._buffer[:], au[round(0.5*rate):round(1.0*rate)]._buffer[:])
+        self.assertEqual(au.slice(0).n_frames, au.n_frames)
+
+        # Negative times are clamped to the start, not wrapped around
+        self.assertEqual(au.slice(-1.0, 0.5).n_frames, round(0.5*rate))
+        self.assertEqual(au.slice(-1.0).n_frames, au.n_frames)
+        self.assertEqual(au.slice(0, -0.5).n_frames, 0)
+
+        view = audio.Audio.concat_view([au, au])
+        part = view.slice(au.duration-0.5, au.duration+0.5)
+        self.assertEqual(part.n_frames, round((au.duration+0.5)*rate)-round((au.duration-0.5)*rate))
+
+
+class ConversionCacheTest(unittest.TestCase):
+    """Test cases of audio.ConversionCache class"""
+
+    def test_convert_with_cache(self):
+        cache = audio.ConversionCache()
+        au = audio.Audio.from_wav_file(SAMPLE_WAV)
+        spec = audio.AudioSpec("F32LE", 2, 48000)
+
+        first = au.convert(spec, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        # the cached result is shared, so it is read-only
+        self.assertTrue(first.as_memoryview().readonly)
+        # samples only the library holds are hashed once
+        self.assertIsNotNone(au._digest)
+        second = au.convert(spec, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIs(first, second)
+        self.assertEqual(cache.size, len(first._buffer))
+
+        # Same content loaded again should hit as well
+        audio.Audio.from_wav_file(SAMPLE_WAV).convert(spec, cache=cache)
+        self.assertEqual(cache.hits, 2)
+
+        # A different target spec is a different entry
+        au.convert(audio.AudioSpec("S16LE", 1, 22050), cache=cache)
+        self.assertEqual((cache.misses, len(cache)), (2, 2))
+
+        # Changing the samples in place should not hit the old entry
+        raw = au.as_memoryview().cast("B")
+        raw[0] ^= 0xff
+        changed = au.convert(spec, cache=cache)
+        self.assertIsNot(changed, first)
+        self.assertEqual(cache.misses, 3)
+
+        self.assertRaises(
+            ValueError,
+            lambda: au.convert(spec, out=bytearray(16), cache=cache)
+        )
+
+    def test_eviction(self):
+        spec = audio.AudioSpec("U8", 1)
+        target = audio.AudioSpec("S16LE", 1)
+        cache = audio.ConversionCache(max_bytes=250)
+        sources = [
+            audio.Audio.from_buffer(bytes([i])*50, spec) for i in range(4)
+        ]
+        for src in sources:
+            src.convert(target, cache=cache)
+        # each converted entry takes 100 bytes
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 2)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+        # the most recently used entries are kept
+        sources[3].convert(target, cache=cache)
+        self.assertEqual(cache.hits, 1)
+        sources[0].convert(target, cache=cache)
+        self.assertEqual(cache.misses, 5)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+
+class AudioConverterTest(unittest.TestCase):
+    """Test cases of audio.AudioConverter class"""
+
+    def test_feed_and_read(self):
+        src_spec = audio.Audio.from_wav_file(SAMPLE_WAV).spec
+        dst_spec = audio.AudioSpec("F32LE", 2, 48000)
+        converter = audio.AudioConverter(src_spec, dst_spec)
+        self.assertEqual(converter.src_spec, src_spec)
+        self.assertEqual(converter.dst_spec, dst_spec)
+
+        parts = []
+        for chunk in audio.Audio.iter_wav_file(SAMPLE_WAV, chunk_frames=777):
+            converter.feed(chunk)
+            part = converter.read()
+            self.assertEqual(part.spec, dst_spec)
+            parts.append(part._buffer[:])
+        converter.flush()
+        parts.append(converter.read()._buffer[:])
+        self.assertEqual(converter.available_data_length(), 0)
+
+        # chunked conversion should match converting the whole audio
+        whole = audio.Audio.from_wav_file(SAMPLE_WAV).convert(dst_spec)
+        self.assertEqual(b"".join(parts), whole._buffer[:])
+
+    def test_read_length(self):
+        spec = audio.AudioSpec("S16LE", 2)
+        converter = audio.AudioConverter(spec, spec)
+        converter.feed(bytes(400))
+        self.assertEqual(len(converter.read(101)._buffer), 100)
+
+        out = bytearray(1000)
+        self.assertEqual(converter.read_into(out), 300)
+
+        converter.feed(bytes(400))
+        converter.clear()
+        self.assertEqual(converter.available_data_length(), 0)
+
+        self.assertRaises(
+            ValueError,
+            lambda: converter.feed(audio.Audio.from_buffer(bytes(4), audio.AudioSpec("F32LE", 1)))
+        )
+        self.assertRaises(
+            TypeError,
+            lambda: audio.AudioConverter(spec, "NOT A SPEC") # type: ignore
+        )
+
+
+class AudioStreamTest(unittest.TestCase):
+    """Test cases of audio.AudioStream class"""
+
+    def setUp(self):
+        self.device = audio.open_default_playback_device()
+        self.stream = audio.AudioStream(self.device)
+
+    def tearDown(self):
+        del self.stream
+        del self.device
+
+    def test_play_file(self):
+        previous_spec = self.stream.src_spec
+        self.stream.play_file(SAMPLE_WAV, chunk_frames=4096, queued_chunks=2)
+        # Returns once drained, with the previous format restored
+        self.assertEqual(self.stream.queued_data_length(), 0)
+        self.assertEqual(self.stream.src_spec, previous_spec)
+
+        # On timeout the queued part is dropped and the format restored
+        self.device.paused = True
+        self.assertRaises(
+            TimeoutError,
+            lambda: self.stream.play_file(SAMPLE_WAV, queued_chunks=2, timeout=0.1)
+        )
+        self.assertEqual(self.stream.queued_data_length(), 0)
+        self.assertEqual(self.stream.src_spec, previous_spec)
+        self.device.paused = False
+
+        self.assertRaises(
+            ValueError,
+            lambda: self.stream.play_file(SAMPLE_WAV, queued_chunks=0)
+        )
+        self.assertRaises(
+            ValueError,
+            lambda: self.stream.play_file(SAMPLE_WAV, timeout=-1)
+        )
+
+    def test_set_source(self):
+        spec = self.stream.src_spec
+        total = spec.frame_size*spec.sample_rate//4 # 0.25s
+        requested = []
+        def source(n_bytes):
+            if sum(requested)>=total:
+                return None
+            requested.append(n_bytes)
+            return bytes(n_bytes)
+        self.stream.set_source(source)
+        self.assertTrue(wait_until(lambda: self.stream._source is None))
+        self.assertGreater(len(requested), 0)
+        for n_bytes in requested:
+            self.assertGreater(n_bytes, 0)
+
+        # An iterable of chunks is accepted as well
+        self.stream.src_spec = audio.Audio.from_wav_file(SAMPLE_WAV).spec
+        self.stream.set_source(audio.Audio.iter_wav_file(SAMPLE_WAV))
+        self.assertTrue(wait_until(lambda: self.stream._source is None))
+
+    def test_set_source_error(self):
+        def source(n_bytes):
+            raise KeyError("error in source")
+        self.stream.set_source(source)
+        def raised():
+            try:
+                self.stream.queued_data_length()
+            except KeyError:
+                return True
+            return False
+        # The error should be raised on this thread
+        self.assertTrue(wait_until(raised))
+        # only once
+        self.stream.queued_data_length()
+
+    def test_wait_drained(self):
+        spec = self.stream.src_spec
+        self.stream.put_audio(audio.Audio.from_buffer(bytes(spec.frame_size*spec.sample_rate//10), spec))
+        self.stream.wait_drained(timeout=10)
+        self.assertEqual(self.stream.queued_data_length(), 0)
+
+        self.device.paused = True
+        self.stream.put_audio(audio.Audio.from_buffer(bytes(spec.frame_size*100), spec))
+        self.assertRaises(
+            TimeoutError,
+            lambda: self.stream.wait_drained(timeout=0.1)
+        )
+        self.device.paused = False
+        self.stream.wait_drained(timeout=10)
+
+    def test_wait_below(self):
+        spec = self.stream.src_spec
+        one_second = spec.frame_size*spec.sample_rate
+        self.stream.put_audio(audio.Audio.from_buffer(bytes(one_second), spec))
+        start = time.monotonic()
+        self.stream.wait_below(one_second//2, timeout=10)
+        self.assertLessEqual(self.stream.queued_data_length(), one_second//2)
+        self.assertGreater(self.stream.queued_data_length(), 0)
+        self.assertGreater(time.monotonic()-start, 0.2)
+
+        self.assertRaises(
+            ValueError,
+            lambda: self.stream.wait_below(0, timeout=-1)
+        )
+
+    def test_aput_audio_and_adrain(self):
+        spec = self.stream.src_spec
+        chunk = audio.Audio.from_buffer(bytes(spec.frame_size*spec.sample_rate//20), spec)
+        async def play():
+            for _ in range(4):
+                await self.stream.aput_audio(chunk)
+                # backpressure keeps at most two chunks queued
+                self.assertLessEqual(self.stream.queued_data_length(), 2*len(chunk._buffer))
+            await self.stream.adrain()
+        asyncio.run(asyncio.wait_for(play(), timeout=10))
+        self.assertEqual(self.stream.queued_data_length(), 0)
+
+    def test_aget_audio(self):
+        recording_device = audio.open_default_recording_device()
+        stream = audio.AudioStream(recording_device)
+        async def record():
+            return await stream.aget_audio()
+        au = asyncio.run(asyncio.wait_for(record(), timeout=10))
+        self.assertIsInstance(au, audio.Audio)
+        self.assertGreater(len(au._buffer), 0)
+        self.assertEqual(stream._async_get_waiters, [])
+
+
+    def test_get_audio_into(self):
+        recording_device = audio.open_default_recording_device()
+        stream = audio.AudioStream(recording_device)
+        frame_size = stream.dst_spec.frame_size
+        buf = bytearray(frame_size*256+1)
+        total = 0
+        deadline = time.monotonic()+10
+        while total==0 and time.monotonic()<deadline:
+            n = stream.get_audio_into(buf)
+            self.assertEqual(n%frame_size, 0)
+            self.assertLessEqual(n, frame_size*256)
+            total += n
+            time.sleep(0.01)
+        self.assertGreater(total, 0)
+        # No export is kept, the buffer can still be resized
+        buf.extend(bytes(frame_size))
+        self.assertIsNone(stream._into_obj)
+
+        # The view of a fixed-size buffer is kept for the next call
+        fixed = (ctypes.c_char*(frame_size*16))()
+        stream.get_audio_into(fixed)
+        self.assertIs(stream._into_obj, fixed)
+        view = stream._into_buffer
+        stream.get_audio_into(fixed)
+        self.assertIs(stream._into_buffer, view)
+
+        self.assertRaises(TypeError, stream.get_audio_into, b"readonly")
+
+    def test_set_capture_ring(self):
+        recording_device = audio.open_default_recording_device()
+        stream = audio.AudioStream(recording_device)
+        frame_size = stream.dst_spec.frame_size
+        self.assertRaises(ValueError, stream.set_capture_ring, frame_size+1)
+        self.assertRaises(ValueError, stream.set_capture_ring, 0)
+
+        stream.set_capture_ring(frame_size*64)
+        au = stream.get_audio(timeout=10)
+        self.assertLessEqual(len(au._buffer), frame_size*64)
+        self.assertEqual(len(au._buffer)%frame_size, 0)
+
+        # the ring keeps only the newest data
+        time.sleep(0.2)
+        self.assertLessEqual(stream.available_data_length(), frame_size*64)
+        self.assertGreater(stream.capture_dropped_bytes, 0)
+
+        stream.set_capture_ring(None)
+        self.assertEqual(stream.capture_dropped_bytes, 0)
+
+    def test_cached_state(self):
+        spec = audio.AudioSpec("F32LE", 1, 22050)
+        self.stream.src_spec = spec
+        self.assertEqual(self.stream.src_spec, spec)
+        self.assertIs(self.stream.src_spec, self.stream.src_spec)
+        self.assertEqual(self.stream.dst_spec, self.device.spec)
+
+        self.stream.gain = 0.5
+        self.assertAlmostEqual(self.stream.gain, 0.5)
+        self.stream.frequency_ratio = 1000
+        self.assertAlmostEqual(self.stream.frequency_ratio, 100) # clamped by SDL
+
+        # Device formats are read from SDL unless the cache is enabled
+        self.assertIsNot(self.device.spec, self.device.spec)
+        audio.enable_device_state_cache()
+        try:
+            self.assertIs(self.device.spec, self.device.spec)
+            self.assertIs(self.stream.dst_spec, self.stream.dst_spec)
+
+            # a device event drops the cached specs
+            cached = self.stream.dst_spec
+            audio._device_state_generation += 1
+            self.assertIsNot(self.stream.dst_spec, cached)
+            self.assertEqual(self.stream.dst_spec, cached)
+        finally:
+            audio.enable_device_state_cache(False)
+
+        self.stream.unbind()
+        self.assertIsNone(self.stream._spec_cache)
+        self.stream.bind(self.device)
+        self.assertEqual(self.stream.dst_spec, self.device.spec)
+        self.assertIs(self.device.name, self.device.name)
+
+    def test_cached_state_recording(self):
+        recording_device = audio.open_default_recording_device()
+        spec = audio.AudioSpec("F32LE", 1, 22050)
+        stream = audio.AudioStream(recording_device, dst_spec=spec)
+        # SDL owns the src side of a recording stream, the dst side is ours
+        self.assertIs(stream.dst_spec, stream.dst_spec)
+        self.assertEqual(stream.dst_spec, spec)
+        self.assertIsNot(stream.src_spec, stream.src_spec)
+        self.assertEqual(stream.src_spec, recording_device.spec)
+
+        audio.enable_device_state_cache()
+        try:
+            self.assertIs(stream.src_spec, stream.src_spec)
+            cached = stream.src_spec
+            audio._device_state_generation += 1
+            self.assertIsNot(stream.src_spec, cached)
+        finally:
+            audio.enable_device_state_cache(False)
+
+        # unbound, both sides are set by the library
+        stream.unbind()
+        self.assertIs(stream.src_spec, stream.src_spec)
+
+    def test_stats(self):
+        self.assertIsNone(self.stream.stats())
+        self.stream.enable_stats()
+        spec = self.stream.src_spec
+        au = audio.Audio.from_buffer(bytes(spec.frame_size*4800), spec)
+        self.stream.put_audio(au)
+        stats = self.stream.stats()
+        self.assertEqual(stats["bytes_put"], au._nbytes)
+        self.assertGreaterEqual(stats["queued_high_water"], au._nbytes)
+
+        # The natural end of the sound isn't an underrun
+        self.stream.wait_drained(timeout=10)
+        time.sleep(0.2)
+        stats = self.stream.stats()
+        self.assertEqual(stats["underruns"], 0)
+        self.assertGreater(stats["callbacks"], 0)
+        self.assertGreater(stats["callback_seconds"], 0)
+        self.assertIn(0, stats["queue_histogram"])
+        self.assertIn(self.stream, [stream for stream, _ in audio.all_stream_stats()])
+
+        self.stream.enable_stats(False)
+        self.assertIsNone(self.stream.stats())
+        self.assertNotIn(self.stream, [stream for stream, _ in audio.all_stream_stats()])
+
+    def test_stats_underruns(self):
+        spec = self.device.spec
+        stream = audio.AudioStream(None, spec, spec)
+        stream.enable_stats()
+        out = bytearray(spec.frame_size*200)
+        # An empty stream that never had data isn't starving
+        stream.get_audio_into(out)
+        stream.put_audio(audio.Audio.from_buffer(bytes(spec.frame_size*100), spec))
+        self.assertEqual(stream.stats()["underruns"], 0)
+
+        # Running short is an underrun once more data follows,
+        # however many requests went unserved in between
+        self.assertEqual(stream.get_audio_into(out), spec.frame_size*100)
+        for _ in range(5):
+            stream.get_audio_into(out)
+        self.assertEqual(stream.stats()["underruns"], 0)
+        stream.put_audio(audio.Audio.from_buffer(bytes(len(out)), spec))
+        self.assertEqual(stream.stats()["underruns"], 1)
+
+        # After flush() the queue may run dry, it is the end of the input
+        self.assertEqual(stream.get_audio_into(out), len(out))
+        stream.flush()
+        stream.get_audio_into(out)
+        stream.put_audio(audio.Audio.from_buffer(bytes(len(out)), spec))
+        self.assertEqual(stream.stats()["underruns"], 1)
+        stream.clear()
+
+        # A source failing before delivering what was asked for
+        def source(n_bytes):
+            raise RuntimeError("source failed")
+        stream.set_source(source)
+        stream.get_audio_into(out)
+        self.assertEqual(stream.stats()["underruns"], 2)
+        self.assertRaises(RuntimeError, stream.put_audio, audio.Audio.from_buffer(bytes(len(out)), spec))
+
+    def test_enable_stream_stats(self):
+        audio.enable_stream_stats()
+        try:
+            spec = self.device.spec
+            stream = audio.AudioStream(None, spec, spec)
+        finally:
+            audio.enable_stream_stats(False)
+        au = audio.Audio.from_buffer(bytes(spec.frame_size*100), spec)
+        stream.put_audio(au)
+        out = bytearray(spec.frame_size*100)
+        self.assertEqual(stream.get_audio_into(out), len(out))
+        stats = stream.stats()
+        self.assertEqual(stats["bytes_put"], len(out))
+        self.assertEqual(stats["bytes_got"], len(out))
+
+class AudioStreamGroupTest(unittest.TestCase):
+    """Test cases of audio.AudioStreamGroup class"""
+
+    def setUp(self):
+        self.device = audio.open_default_playback_device()
+        self.spec = self.device.spec
+        self.streams = [
+            audio.AudioStream(None, self.spec, self.spec) for _ in range(3)
+        ]
+        self.group = audio.AudioStreamGroup(self.streams)
+
+    def tearDown(self):
+        del self.group
+        del self.streams
+        del self.device
+
+    def test___init__(self):
+        self.assertEqual(len(self.group), 3)
+        self.assertEqual(list(self.group), self.streams)
+        self.assertRaises(TypeError, audio.AudioStreamGroup, ["NOT A STREAM"])
+        self.assertRaises(ValueError, audio.AudioStreamGroup, [self.streams[0]]*2)
+
+    def test_start(self):
+        au = audio.Audio.from_buffer(bytes(self.spec.frame_size*4800), self.spec)
+        self.group.start(self.device, [au]*3)
+        for stream in self.streams:
+            self.assertEqual(stream.dst_spec, self.spec)
+            self.assertGreater(stream.queued_data_length(), 0)
+        self.assertRaises(ValueError, self.group.put_audio, [au])
+
+        with self.group:
+            self.assertRaises(RuntimeError, self.group.bind, self.device)
+            self.assertRaises(RuntimeError, self.group.unbind)
+            self.group.set_gain(0.5)
+        for stream in self.streams:
+            self.assertAlmostEqual(stream.gain, 0.5)
+        self.group.set_gain([0.1, 0.2, 0.3])
+        self.assertAlmostEqual(self.streams[2].gain, 0.3)
+        self.assertRaises(ValueError, self.group.set_gain, [1.0])
+
+        self.group.clear()
+        for stream in self.streams:
+            self.assertEqual(stream.queued_data_length(), 0)
+        self.group.unbind()
+
+    def test_put_audio_stats(self):
+        for stream in self.streams:
+            stream.enable_stats()
+        au = audio.Audio.from_buffer(bytes(self.spec.frame_size*100), self.spec)
+        self.group.put_audio([au]*3)
+        for stream in self.streams:
+            stats = stream.stats()
+            self.assertEqual(stats["bytes_put"], au._nbytes)
+            self.assertEqual(stats["queued_high_water"], au._nbytes)
+
+class AudioStreamPoolTest(unittest.TestCase):
+    """Test cases of audio.AudioStreamPool class"""
+
+    def setUp(self):
+        self.device = audio.open_default_playback_device()
+        self.pool = audio.AudioStreamPool(max_streams=2, idle_timeout=None)
+
+    def tearDown(self):
+        del self.pool
+        del self.device
+
+    def test_acquire_and_release(self):
+        stream = self.pool.acquire(self.device)
+        self.assertEqual(self.pool.misses, 1)
+        stream.put_audio(audio.Audio.from_buffer(bytes(self.device.spec.frame_size*100), self.device.spec))
+        stream.gain = 0.5
+        self.pool.release(stream)
+        self.assertEqual(len(self.pool), 1)
+        self.assertRaises(ValueError, self.pool.release, stream)
+
+        reused = self.pool.acquire(self.device)
+        self.assertIs(reused, stream)
+        self.assertEqual(self.pool.hits, 1)
+        self.assertEqual(reused.queued_data_length(), 0)
+        self.assertAlmostEqual(reused.gain, 1.0)
+
+        # a different source spec is another key
+        other_spec = audio.AudioSpec("S16LE", 1, 22050)
+        other = self.pool.acquire(self.device, other_spec)
+        self.assertIsNot(other, stream)
+        self.assertEqual(other.src_spec, other_spec)
+        self.assertEqual(self.pool.misses, 2)
+
+    def test_release_failed_source(self):
+        stream = self.pool.acquire(self.device)
+        def source(n_bytes):
+            raise RuntimeError("source failed")
+        stream.set_source(source)
+        self.assertTrue(wait_until(lambda: stream._source_error is not None))
+
+        # the error of the source doesn't stop the stream from being pooled
+        self.pool.release(stream)
+        self.assertEqual(len(self.pool), 1)
+        reused = self.pool.acquire(self.device)
+        self.assertIs(reused, stream)
+        self.assertIsNone(reused._source)
+        reused.put_audio(audio.Audio.from_buffer(bytes(self.device.spec.frame_size), self.device.spec))
+
+    def test_eviction(self):
+        streams = [self.pool.acquire(self.device) for _ in range(3)]
+        for stream in streams:
+            self.pool.release(stream)
+        self.assertEqual(len(self.pool), 2)
+        self.assertEqual(self.pool.evictions, 1)
+        # the oldest released stream is evicted first
+        self.assertIsNot(self.pool.acquire(self.device), streams[0])
+
+        pool = audio.AudioStreamPool(idle_timeout=0)
+        pool.release(pool.acquire(self.device))
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(pool.evictions, 1)
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class MixerTest(unittest.TestCase):
+    """Test cases of audio.Mixer class"""
+
+    def setUp(self):
+        self.device = audio.open_default_playback_device()
+        self.mixer = audio.Mixer(self.device, n_voices=2)
+        self.sound = audio.Audio.from_numpy(
+            numpy.full((1000, 2), 0.25, numpy.float32),
+            self.mixer.spec.sample_rate
+        )
+
+    def tearDown(self):
+        del self.mixer
+        del self.device
+
+    def test___init__(self):
+        self.assertRaises(TypeError, audio.Mixer, "NOT A DEVICE")
+        self.assertRaises(ValueError, audio.Mixer, self.device, n_voices=0)
+        self.assertEqual(len(self.mixer.voices), 2)
+        self.assertEqual(self.mixer.spec.n_channels, 2)
+        self.assertRaises(TypeError, audio.Voice)
+
+    def test_play(self):
+        voice = self.mixer.play(self.sound, gain=0.5, pan=-1.0)
+        self.assertTrue(voice.playing)
+        self.assertEqual(self.mixer.n_playing, 1)
+        self.assertRaises(ValueError, self.mixer.play, self.sound, pan=2)
+        self.assertRaises(ValueError, self.mixer.play, self.sound, pitch=0)
+        self.assertRaises(TypeError, self.mixer.play, b"NOT AN AUDIO")
+
+        # the oldest voice is stolen when the pool is full
+        second = self.mixer.play(self.sound)
+        third = self.mixer.play(self.sound)
+        self.assertIs(third, voice)
+        self.assertIsNot(second, voice)
+
+        self.mixer.stop_all()
+        self.assertEqual(self.mixer.n_playing, 0)
+
+    def test_mix(self):
+        self.device.paused = True
+        frame_size = self.mixer.spec.frame_size
+        voice = self.mixer.play(self.sound, gain=0.5, pan=1.0)
+        out = self.mixer._mix(600*frame_size)
+        self.assertEqual(out.shape, (600, 2))
+        numpy.testing.assert_allclose(out[:, 0], 0)
+        numpy.testing.assert_allclose(out[:, 1], 0.125)
+
+        # a voice stops at the end of its sound unless it loops
+        out = self.mixer._mix(600*frame_size)
+        numpy.testing.assert_allclose(out[400:], 0)
+        self.assertFalse(voice.playing)
+
+        voice = self.mixer.play(self.sound, pitch=2.0, loop=True)
+        out = self.mixer._mix(2000*frame_size)
+        numpy.testing.assert_allclose(out, 0.25)
+        self.assertTrue(voice.playing)
+
+class SoundBankTest(unittest.TestCase):
+    """Test cases of audio.SoundBank class"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(SAMPLE_WAV, "rb") as f:
+            data = f.read()
+        os.mkdir(os.path.join(self.tmp.name, "ui"))
+        for name in ("jump.wav", "coin.wav", os.path.join("ui", "click.wav")):
+            with open(os.path.join(self.tmp.name, name), "wb") as f:
+                f.write(data)
+        self.spec = audio.AudioSpec("F32LE", 2, 48000)
+        self.sample = audio.Audio.from_wav_file(SAMPLE_WAV).convert(self.spec)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_from_directory(self):
+        bank = audio.SoundBank.from_directory(self.tmp.name, self.spec)
+        self.assertEqual(sorted(bank), ["coin", "jump", "ui/click"])
+        self.assertIn("ui/click", bank)
+        self.assertRaises(KeyError, lambda: bank["missing"])
+
+        sound = bank["jump"]
+        self.assertEqual(sound.spec, self.spec)
+        self.assertEqual(sound.as_memoryview().tobytes(), self.sample.as_memoryview().tobytes())
+        self.assertIs(bank["jump"], sound)
+        self.assertEqual(bank.size, sound._nbytes)
+
+    def test_from_manifest(self):
+        manifest = os.path.join(self.tmp.name, "sounds.json")
+        with open(manifest, "w") as f:
+            f.write('{"jump": "jump.wav", "click": "ui/click.wav"}')
+        bank = audio.SoundBank.from_manifest(manifest, self.spec)
+        self.assertEqual(sorted(bank), ["click", "jump"])
+        self.assertEqual(bank["click"].spec, self.spec)
+
+    def test_preload(self):
+        bank = audio.SoundBank.from_directory(self.tmp.name, self.spec)
+        bank["coin"] # loaded first, moved into the arena
+        bank.preload()
+        self.assertEqual(bank.size, 0)
+        self.assertEqual(bank.arena_size, self.sample._nbytes*3)
+        for name in bank:
+            sound = bank[name]
+            self.assertEqual(sound.as_memoryview().tobytes(), self.sample.as_memoryview().tobytes())
+            # sounds share the memory of the arena
+            offset = ctypes.addressof(sound._buffer)-ctypes.addressof(bank._arena._buffer)
+            self.assertTrue(0<=offset<bank.arena_size)
+        self.assertRaises(KeyError, bank.preload, ["missing"])
+
+    def test_max_bytes(self):
+        bank = audio.SoundBank.from_directory(
+            self.tmp.name, self.spec, max_bytes=self.sample._nbytes*2
+        )
+        first = bank["jump"]
+        bank["coin"]
+        bank["jump"] # most recently used
+        bank["ui/click"]
+        self.assertEqual(bank.size, self.sample._nbytes*2)
+        self.assertIs(bank["jump"], first)
+        bank.unload("jump")
+        self.assertEqual(bank.size, self.sample._nbytes)
+        bank.unload()
+        self.assertEqual(bank.size, 0)
+
+class PCMCacheTest(unittest.TestCase):
+    """Test cases of audio.PCMCache class"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.wav = os.path.join(self.tmp.name, "sample.wav")
+        with open(SAMPLE_WAV, "rb") as f:
+            data = f.read()
+        with open(self.wav, "wb") as f:
+            f.write(data)
+        self.cache = audio.PCMCache(os.path.join(self.tmp.name, "cache"))
+        self.spec = audio.AudioSpec("F32LE", 1, 22050)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_wav(self):
+        expected = audio.Audio.from_wav_file(self.wav).convert(self.spec)
+        au = self.cache.load_wav(self.wav, self.spec)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+        self.assertEqual(au.as_memoryview().tobytes(), expected.as_memoryview().tobytes())
+
+        au = self.cache.load_wav(self.wav, self.spec)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(au.spec, self.spec)
+        self.assertEqual(au.as_memoryview().tobytes(), expected.as_memoryview().tobytes())
+
+        # another spec is another entry
+        self.cache.load_wav(self.wav, audio.AudioSpec("S16LE", 2, 48000))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_invalidation(self):
+        self.cache.load_wav(self.wav, self.spec)
+        # a new mtime with the same content is still a hit
+        os.utime(self.wav, ns=(0, 0))
+        self.cache.load_wav(self.wav, self.spec)
+        self.assertEqual(self.cache.hits, 1)
+
+        # the new mtime is stored, the next hit doesn't hash the file
+        file_digest = audio._file_digest
+        audio._file_digest = lambda filename: self.fail("the file was hashed again")
+        try:
+            self.cache.load_wav(self.wav, self.spec)
+        finally:
+            audio._file_digest = file_digest
+        self.assertEqual(self.cache.hits, 2)
+
+        # same size and the stored mtime restored, the ctime still differs
+        with open(self.wav, "r+b") as f:
+            f.seek(-4, os.SEEK_END)
+            f.write(b"\x01\x02\x03\x04")
+        os.utime(self.wav, ns=(0, 0))
+        self.cache.load_wav(self.wav, self.spec)
+        self.assertEqual(self.cache.misses, 2)
+
+        self.cache.clear()
+        self.cache.load_wav(self.wav, self.spec)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_verify(self):
+        cache = audio.PCMCache(self.cache.directory, verify=True)
+        cache.load_wav(self.wav, self.spec)
+        file_digest = audio._file_digest
+        hashed = []
+        audio._file_digest = lambda filename: hashed.append(filename) or file_digest(filename)
+        try:
+            cache.load_wav(self.wav, self.spec)
+        finally:
+            audio._file_digest = file_digest
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(hashed, [self.wav])
 
 if __name__ == '__main__':
     unittest.main()